@@ -3,6 +3,7 @@
 import asyncio
 import os
 import sys
+from io import StringIO
 
 # Check for API key
 if not os.environ.get("ANTHROPIC_API_KEY"):
@@ -10,107 +11,128 @@ if not os.environ.get("ANTHROPIC_API_KEY"):
     print("   Set it with: export ANTHROPIC_API_KEY=your_key")
     print()
 
-async def test_basic_import():
+async def test_basic_import(out):
     """Test basic imports work."""
-    print("1. Testing imports...")
+    print("1. Testing imports...", file=out)
     try:
         from forge import Forge
         from forge.agents import ALL_AGENTS
         from forge.agents.claude_agent import ClaudeAgent, ClaudeAgentWithClient
         from forge.agents.base import AgentDefinition, Task, AgentResult
-        print("   ✓ All imports successful")
+        print("   ✓ All imports successful", file=out)
         return True
     except Exception as e:
-        print(f"   ✗ Import failed: {e}")
+        print(f"   ✗ Import failed: {e}", file=out)
         return False
 
-async def test_forge_initialization():
+async def test_forge_initialization(out):
     """Test Forge can be initialized."""
-    print("\n2. Testing Forge initialization...")
+    print("\n2. Testing Forge initialization...", file=out)
     try:
         from forge import Forge
         forge = Forge()
         agents = forge.list_agents()
-        print(f"   ✓ Forge initialized with {len(agents)} agents")
+        print(f"   ✓ Forge initialized with {len(agents)} agents", file=out)
         return True
     except Exception as e:
-        print(f"   ✗ Initialization failed: {e}")
+        print(f"   ✗ Initialization failed: {e}", file=out)
         return False
 
-async def test_agent_creation():
+async def test_agent_creation(out):
     """Test agent creation."""
-    print("\n3. Testing agent creation...")
+    print("\n3. Testing agent creation...", file=out)
     try:
         from forge import Forge
         forge = Forge()
         agent = forge.get_agent("backend_analyzer")
         if agent:
-            print(f"   ✓ Agent created: {agent.definition.name}")
-            print(f"     Model: {agent.definition.model}")
-            print(f"     Tools: {agent.definition.tools}")
+            print(f"   ✓ Agent created: {agent.definition.name}", file=out)
+            print(f"     Model: {agent.definition.model}", file=out)
+            print(f"     Tools: {agent.definition.tools}", file=out)
             return True
         else:
-            print("   ✗ Agent not found")
+            print("   ✗ Agent not found", file=out)
             return False
     except Exception as e:
-        print(f"   ✗ Agent creation failed: {e}")
+        print(f"   ✗ Agent creation failed: {e}", file=out)
         return False
 
-async def test_sdk_availability():
+async def test_sdk_availability(out):
     """Test Claude Agent SDK is available."""
-    print("\n4. Testing Claude Agent SDK availability...")
+    print("\n4. Testing Claude Agent SDK availability...", file=out)
     try:
         from claude_agent_sdk import query, ClaudeAgentOptions, AssistantMessage
-        print("   ✓ Claude Agent SDK imported successfully")
+        print("   ✓ Claude Agent SDK imported successfully", file=out)
         return True
     except ImportError as e:
-        print(f"   ✗ SDK not available: {e}")
+        print(f"   ✗ SDK not available: {e}", file=out)
         return False
 
-async def test_custom_tools():
+async def test_custom_tools(out):
     """Test custom Forge tools."""
-    print("\n5. Testing custom Forge tools...")
+    print("\n5. Testing custom Forge tools...", file=out)
     try:
         from forge.tools.forge_tools import FORGE_TOOLS, get_forge_tools
         tools = get_forge_tools()
-        print(f"   ✓ {len(tools)} custom tools available:")
+        print(f"   ✓ {len(tools)} custom tools available:", file=out)
         for tool in tools:
             name = getattr(tool, '_tool_name', tool.__name__)
-            print(f"     - {name}")
+            print(f"     - {name}", file=out)
         return True
     except Exception as e:
-        print(f"   ✗ Custom tools failed: {e}")
+        print(f"   ✗ Custom tools failed: {e}", file=out)
         return False
 
-async def test_cost_tracker():
+async def test_cost_tracker(out):
     """Test cost tracking."""
-    print("\n6. Testing cost tracker...")
+    print("\n6. Testing cost tracker...", file=out)
     try:
         from forge.utils.cost_tracker import CostTracker
         tracker = CostTracker(budget_usd=10.0)
         tracker.record("claude-sonnet-4", input_tokens=1000, output_tokens=500)
         summary = tracker.get_summary()
-        print(f"   ✓ Cost tracker working")
-        print(f"     Total cost: ${summary['total_cost_usd']:.4f}")
-        print(f"     Budget: ${summary['budget_usd']:.2f}")
+        print(f"   ✓ Cost tracker working", file=out)
+        print(f"     Total cost: ${summary['total_cost_usd']:.4f}", file=out)
+        print(f"     Budget: ${summary['budget_usd']:.2f}", file=out)
         return True
     except Exception as e:
-        print(f"   ✗ Cost tracker failed: {e}")
+        print(f"   ✗ Cost tracker failed: {e}", file=out)
         return False
 
-async def main():
-    """Run all tests."""
+# (name, check) pairs; pass names on the command line to run a subset
+TESTS = [
+    ("imports", test_basic_import),
+    ("init", test_forge_initialization),
+    ("create", test_agent_creation),
+    ("sdk", test_sdk_availability),
+    ("tools", test_custom_tools),
+    ("cost", test_cost_tracker),
+]
+
+async def main(selected: list[str] | None = None):
+    """Run all tests, or only the named ones."""
     print("=" * 50)
     print("Forge SDK Integration Tests")
     print("=" * 50)
     
-    results = []
-    results.append(await test_basic_import())
-    results.append(await test_forge_initialization())
-    results.append(await test_agent_creation())
-    results.append(await test_sdk_availability())
-    results.append(await test_custom_tools())
-    results.append(await test_cost_tracker())
+    names = set(selected or ()) or {name for name, _ in TESTS}
+    unknown = names - {name for name, _ in TESTS}
+    if unknown:
+        print(f"Unknown tests: {', '.join(sorted(unknown))}")
+        print(f"Available: {', '.join(name for name, _ in TESTS)}")
+        return 2
+    tests = [test for name, test in TESTS if name in names]
+    
+    # The checks are independent, so run them concurrently and buffer each
+    # one's output to keep the report readable.
+    buffers = [StringIO() for _ in tests]
+    outcomes = await asyncio.gather(
+        *(test(buf) for test, buf in zip(tests, buffers)),
+        return_exceptions=True,
+    )
+    for buf in buffers:
+        sys.stdout.write(buf.getvalue())
+    results = [outcome is True for outcome in outcomes]
     
     print("\n" + "=" * 50)
     passed = sum(results)
@@ -125,4 +147,4 @@ async def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(asyncio.run(main(sys.argv[1:])))
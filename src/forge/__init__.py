@@ -3,10 +3,29 @@ Forge: AI-Powered Software Engineering Platform
 
 A multi-agent system for code analysis, debugging, and improvement.
 """
+import importlib
+from typing import Any
 
 __version__ = "0.1.0"
 
-from forge.orchestrator import Forge
-from forge.config.settings import ForgeSettings
+# Resolved on first access so that importing a submodule (e.g. the CLI)
+# doesn't pull in the orchestrator, pydantic and the SDKs
+_LAZY = {
+    "Forge": ("forge.orchestrator", "Forge"),
+    "ForgeSettings": ("forge.config.settings", "ForgeSettings"),
+}
 
 __all__ = ["Forge", "ForgeSettings", "__version__"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    mod_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(mod_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
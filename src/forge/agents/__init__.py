@@ -1,38 +1,115 @@
-"""Forge agents module."""
+"""Forge agents module.
+
+Only the base classes are imported eagerly. Everything else (agent
+implementations, registries, workflow templates) is resolved on first
+attribute access via PEP 562 ``__getattr__`` and cached in the module globals.
+``get_agent`` walks the registry tiers in order, so looking up an action
+agent never imports the infrastructure or persona-testing modules.
+"""
+import importlib
+from collections import ChainMap
+from typing import Any
+
 from forge.agents.base import AgentDefinition, AgentResult, BaseAgent, Task
-from forge.agents.claude_agent import ClaudeAgent
-from forge.agents.direct_llm_agent import DirectLLMAgent, MultiLLMOrchestrator
-from forge.agents.specialists import SPECIALIST_AGENTS, get_specialist, list_specialists
-from forge.agents.actions import ACTION_AGENTS, get_action_agent, list_action_agents
-from forge.agents.infrastructure import INFRASTRUCTURE_AGENTS, get_infrastructure_agent, list_infrastructure_agents
-from forge.agents.api_architect import API_ARCHITECT
-from forge.agents.solution_architect import (
-    SOLUTION_ARCHITECT,
-    SolutionArchitect,
-    WORKFLOW_TEMPLATES,
-    get_workflow_template,
-    list_workflow_templates,
+
+# Public name -> (module, attribute) for lazily imported objects
+_LAZY = {
+    "ClaudeAgent": ("forge.agents.claude_agent", "ClaudeAgent"),
+    "DirectLLMAgent": ("forge.agents.direct_llm_agent", "DirectLLMAgent"),
+    "MultiLLMOrchestrator": ("forge.agents.direct_llm_agent", "MultiLLMOrchestrator"),
+    "SPECIALIST_AGENTS": ("forge.agents.specialists", "SPECIALIST_AGENTS"),
+    "get_specialist": ("forge.agents.specialists", "get_specialist"),
+    "list_specialists": ("forge.agents.specialists", "list_specialists"),
+    "ACTION_AGENTS": ("forge.agents.actions", "ACTION_AGENTS"),
+    "get_action_agent": ("forge.agents.actions", "get_action_agent"),
+    "list_action_agents": ("forge.agents.actions", "list_action_agents"),
+    "INFRASTRUCTURE_AGENTS": ("forge.agents.infrastructure", "INFRASTRUCTURE_AGENTS"),
+    "get_infrastructure_agent": ("forge.agents.infrastructure", "get_infrastructure_agent"),
+    "list_infrastructure_agents": ("forge.agents.infrastructure", "list_infrastructure_agents"),
+    "API_ARCHITECT": ("forge.agents.api_architect", "API_ARCHITECT"),
+    "SOLUTION_ARCHITECT": ("forge.agents.solution_architect", "SOLUTION_ARCHITECT"),
+    "SolutionArchitect": ("forge.agents.solution_architect", "SolutionArchitect"),
+    "WORKFLOW_TEMPLATES": ("forge.agents.solution_architect", "WORKFLOW_TEMPLATES"),
+    "get_workflow_template": ("forge.agents.solution_architect", "get_workflow_template"),
+    "list_workflow_templates": ("forge.agents.solution_architect", "list_workflow_templates"),
+    "PERSONA_TESTING_AGENTS": ("forge.agents.persona_tester", "PERSONA_TESTING_AGENTS"),
+    "get_persona_testing_agent": ("forge.agents.persona_tester", "get_persona_testing_agent"),
+    "list_persona_testing_agents": ("forge.agents.persona_tester", "list_persona_testing_agents"),
+}
+
+
+def _load(name: str) -> Any:
+    """Return a public name, importing/building it on first use."""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+def _build_extended_specialists() -> dict[str, AgentDefinition]:
+    # Add API Architect to specialists (it's a Tier 1 agent)
+    return {**_load("SPECIALIST_AGENTS"), "api_architect": _load("API_ARCHITECT")}
+
+
+def _build_meta_agents() -> dict[str, AgentDefinition]:
+    # Meta-agents (orchestration layer)
+    return {"solution_architect": _load("SOLUTION_ARCHITECT")}
+
+
+# Registry tiers in lookup order; each tier module is imported only when reached
+_TIERS = (
+    "EXTENDED_SPECIALISTS",
+    "ACTION_AGENTS",
+    "INFRASTRUCTURE_AGENTS",
+    "META_AGENTS",
+    "PERSONA_TESTING_AGENTS",
 )
-from forge.agents.persona_tester import PERSONA_TESTING_AGENTS, get_persona_testing_agent, list_persona_testing_agents
 
-# Add API Architect to specialists (it's a Tier 1 agent)
-EXTENDED_SPECIALISTS = {**SPECIALIST_AGENTS, "api_architect": API_ARCHITECT}
 
-# Meta-agents (orchestration layer)
-META_AGENTS = {"solution_architect": SOLUTION_ARCHITECT}
+def _build_all_agents() -> ChainMap:
+    # ChainMap looks keys up left to right but iterates right to left, so
+    # reversing the tiers keeps the old merge's precedence and listing order.
+    return ChainMap(*(_load(tier) for tier in reversed(_TIERS)))
+
+
+# Registries merged from several submodules, built on first access
+_COMPOSITE = {
+    "EXTENDED_SPECIALISTS": _build_extended_specialists,
+    "META_AGENTS": _build_meta_agents,
+    "ALL_AGENTS": _build_all_agents,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        mod_name, attr = _LAZY[name]
+        value = getattr(importlib.import_module(mod_name), attr)
+    elif name in _COMPOSITE:
+        value = _COMPOSITE[name]()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY) | set(_COMPOSITE))
 
-ALL_AGENTS = {**EXTENDED_SPECIALISTS, **ACTION_AGENTS, **INFRASTRUCTURE_AGENTS, **META_AGENTS, **PERSONA_TESTING_AGENTS}
 
 def get_agent(name: str) -> AgentDefinition | None:
-    return ALL_AGENTS.get(name)
+    for tier in _TIERS:
+        agents = _load(tier)
+        if name in agents:
+            return agents[name]
+    return None
 
 def list_all_agents() -> list[str]:
-    return list(ALL_AGENTS.keys())
+    return list(_load("ALL_AGENTS").keys())
 
 __all__ = [
     "AgentDefinition", "AgentResult", "BaseAgent", "Task", "ClaudeAgent",
     "DirectLLMAgent", "MultiLLMOrchestrator",
-    "SPECIALIST_AGENTS", "EXTENDED_SPECIALISTS", "ACTION_AGENTS", "INFRASTRUCTURE_AGENTS", 
+    "SPECIALIST_AGENTS", "EXTENDED_SPECIALISTS", "ACTION_AGENTS", "INFRASTRUCTURE_AGENTS",
     "META_AGENTS", "PERSONA_TESTING_AGENTS", "ALL_AGENTS",
     "API_ARCHITECT", "SOLUTION_ARCHITECT", "SolutionArchitect",
     "WORKFLOW_TEMPLATES", "get_workflow_template", "list_workflow_templates",
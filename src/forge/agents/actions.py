@@ -11,8 +11,8 @@ DEBUGGER = AgentDefinition(
 4. Verify the fix doesn't break other code
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Edit", "Bash", "Grep"],
-    capabilities=["bug_fixing", "debugging"],
+    tools=("Read", "Write", "Edit", "Bash", "Grep"),
+    capabilities=("bug_fixing", "debugging"),
 )
 
 IMPROVER = AgentDefinition(
@@ -25,8 +25,8 @@ IMPROVER = AgentDefinition(
 4. Maintain backward compatibility
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Edit", "Bash"],
-    capabilities=["refactoring", "optimization"],
+    tools=("Read", "Write", "Edit", "Bash"),
+    capabilities=("refactoring", "optimization"),
 )
 
 TESTER = AgentDefinition(
@@ -39,8 +39,8 @@ TESTER = AgentDefinition(
 4. Report test coverage
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Bash"],
-    capabilities=["testing", "quality_assurance"],
+    tools=("Read", "Write", "Bash"),
+    capabilities=("testing", "quality_assurance"),
 )
 
 DOCUMENTER = AgentDefinition(
@@ -53,8 +53,8 @@ DOCUMENTER = AgentDefinition(
 4. Generate API documentation
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Edit"],
-    capabilities=["documentation"],
+    tools=("Read", "Write", "Edit"),
+    capabilities=("documentation",),
 )
 
 PROJECT_STEWARD = AgentDefinition(
@@ -68,8 +68,8 @@ PROJECT_STEWARD = AgentDefinition(
 5. Update license year
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Edit", "Bash", "Glob"],
-    capabilities=["project_maintenance"],
+    tools=("Read", "Write", "Edit", "Bash", "Glob"),
+    capabilities=("project_maintenance",),
 )
 
 ACTION_AGENTS = {
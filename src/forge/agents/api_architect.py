@@ -19,6 +19,9 @@ Usage:
     result = await agent.execute(task)
 """
 
+from types import MappingProxyType
+from typing import Any
+
 from forge.agents.base import AgentDefinition
 
 API_ARCHITECT = AgentDefinition(
@@ -119,8 +122,8 @@ When designing APIs, provide:
 
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Grep", "Glob", "Bash"],
-    capabilities=[
+    tools=("Read", "Write", "Grep", "Glob", "Bash"),
+    capabilities=(
         "api_design",
         "rest_api",
         "graphql",
@@ -128,7 +131,7 @@ When designing APIs, provide:
         "documentation",
         "security_patterns",
         "versioning",
-    ],
+    ),
 )
 
 
@@ -175,8 +178,50 @@ MIGRATE_API_PROMPT = """Create a migration plan from the current API to the targ
 
 # Helper functions for API design tasks
 
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists into read-only MappingProxyType/tuple."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze: plain, JSON-serializable dicts and lists."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+# Static parts of the OpenAPI template, built once at import
+_OPENAPI_SERVERS = _freeze([
+    {"url": "https://api.example.com/v1", "description": "Production"},
+    {"url": "https://staging-api.example.com/v1", "description": "Staging"},
+])
+
+_OPENAPI_SECURITY_SCHEMES = _freeze({
+    "bearerAuth": {
+        "type": "http",
+        "scheme": "bearer",
+        "bearerFormat": "JWT",
+    },
+    "apiKey": {
+        "type": "apiKey",
+        "in": "header",
+        "name": "X-API-Key",
+    },
+})
+
+
 def create_openapi_template(title: str, version: str = "1.0.0") -> dict:
-    """Create a basic OpenAPI 3.1 template."""
+    """Create a basic OpenAPI 3.1 template.
+    
+    The result is meant to be filled in and serialized, so it is built from
+    plain dicts and lists rather than the shared frozen constants.
+    """
     return {
         "openapi": "3.1.0",
         "info": {
@@ -184,25 +229,11 @@ def create_openapi_template(title: str, version: str = "1.0.0") -> dict:
             "version": version,
             "description": f"API specification for {title}",
         },
-        "servers": [
-            {"url": "https://api.example.com/v1", "description": "Production"},
-            {"url": "https://staging-api.example.com/v1", "description": "Staging"},
-        ],
+        "servers": _thaw(_OPENAPI_SERVERS),
         "paths": {},
         "components": {
             "schemas": {},
-            "securitySchemes": {
-                "bearerAuth": {
-                    "type": "http",
-                    "scheme": "bearer",
-                    "bearerFormat": "JWT",
-                },
-                "apiKey": {
-                    "type": "apiKey",
-                    "in": "header",
-                    "name": "X-API-Key",
-                },
-            },
+            "securitySchemes": _thaw(_OPENAPI_SECURITY_SCHEMES),
         },
         "security": [{"bearerAuth": []}],
     }
@@ -243,9 +274,9 @@ type MutationResult {{
 '''
 
 
-# API design patterns library
+# API design patterns library (read-only, safe to share)
 
-API_PATTERNS = {
+API_PATTERNS = _freeze({
     "pagination": {
         "cursor": {
             "description": "Cursor-based pagination for large datasets",
@@ -320,4 +351,4 @@ API_PATTERNS = {
             "example": "Accept: application/vnd.api+json;version=2",
         },
     },
-}
+})
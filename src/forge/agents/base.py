@@ -1,26 +1,129 @@
 """Base Agent Classes"""
 import logging
+import re
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@lru_cache(maxsize=1)
+def _get_jinja():
+    """Import jinja2 once, on first template render."""
+    from jinja2 import Template
+    return Template
+
+# Matches templates whose only placeholder is ``{{ context | default('') }}``
+_SIMPLE_CONTEXT_TEMPLATE = re.compile(
+    r"(?s)(.*?)\{\{\s*context\s*\|\s*default\((?:''|\"\")\)\s*\}\}(.*)"
+)
+_JINJA_TAGS = ("{{", "{%", "{#")
+
+# Shared tuples for tool/capability lists, so identical lists are stored once
+_TOOL_CACHE: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+def _intern(names: Any) -> tuple[str, ...]:
+    names = tuple(names)
+    return _TOOL_CACHE.setdefault(names, names)
+
+# Tools that write files, and those plus running arbitrary commands
+EDIT_TOOLS = frozenset({"Write", "Edit", "MultiEdit", "NotebookEdit"})
+MUTATING_TOOLS = EDIT_TOOLS | {"Bash"}
+
+# Closing instructions appended to every analysis prompt
+ANALYSIS_INSTRUCTIONS = """## Instructions
+1. Analyze the codebase thoroughly
+2. Identify issues based on your focus areas
+3. Provide detailed findings with file locations and line numbers
+4. Suggest specific fixes for each issue
+5. Prioritize issues by severity (critical, high, medium, low)
+
+When you are done analyzing, provide a clear summary of your findings.
+"""
+
+@dataclass(frozen=True, slots=True)
 class AgentDefinition:
     name: str
     description: str
     prompt_template: str = ""
     model: str = "claude-sonnet-4-20250514"
-    tools: list[str] = field(default_factory=list)
+    tools: tuple[str, ...] = ()
     max_turns: int = 50
-    capabilities: list[str] = field(default_factory=list)
-    focus_areas: list[str] = field(default_factory=list)
+    capabilities: tuple[str, ...] = ()
+    focus_areas: tuple[str, ...] = ()
+    _compiled: Any = field(default=None, init=False, repr=False, compare=False)
+    _simple: bool = field(default=False, init=False, repr=False, compare=False)
+    _prefix: str = field(default="", init=False, repr=False, compare=False)
+    _suffix: str = field(default="", init=False, repr=False, compare=False)
     
-    def render_prompt(self, context: dict[str, Any] | None = None) -> str:
-        from jinja2 import Template
-        template = Template(self.prompt_template)
-        return template.render(**(context or {}))
+    def __post_init__(self):
+        # Frozen dataclass: derived fields are set through object.__setattr__
+        set_field = object.__setattr__
+        set_field(self, "tools", _intern(self.tools))
+        set_field(self, "capabilities", _intern(self.capabilities))
+        set_field(self, "focus_areas", _intern(self.focus_areas))
+        
+        match = _SIMPLE_CONTEXT_TEMPLATE.fullmatch(self.prompt_template)
+        if match and not any(tag in match.group(1) + match.group(2) for tag in _JINJA_TAGS):
+            set_field(self, "_simple", True)
+            set_field(self, "_prefix", match.group(1))
+            # Jinja drops a single trailing newline by default
+            set_field(self, "_suffix", match.group(2).removesuffix("\n"))
+    
+    @property
+    def edits_files(self) -> bool:
+        """Whether the agent has tools that write files."""
+        return not EDIT_TOOLS.isdisjoint(self.tools)
+    
+    @property
+    def read_only(self) -> bool:
+        """Whether the agent has no tools that change files or run commands."""
+        return MUTATING_TOOLS.isdisjoint(self.tools)
+    
+    @property
+    def static_prompt(self) -> str | None:
+        """Role text for plain or context-only templates, None if it needs rendering."""
+        if self._simple:
+            return self._prefix + self._suffix
+        if not any(tag in self.prompt_template for tag in _JINJA_TAGS):
+            return self.prompt_template
+        return None
+    
+    def render_prompt(self, context: Mapping[str, Any] | None = None) -> str:
+        if self._simple:
+            if context and "context" in context:
+                return f"{self._prefix}{context['context']}{self._suffix}"
+            return self._prefix + self._suffix
+        # Plain templates need no Jinja at all
+        if not any(tag in self.prompt_template for tag in _JINJA_TAGS):
+            return self.prompt_template
+        key = _context_key(context)
+        if key is None:
+            return self._template().render(**(context or {}))
+        return _render_jinja(self, key)
+    
+    def _template(self):
+        """Compiled Jinja template, built on first use."""
+        if self._compiled is None:
+            object.__setattr__(self, "_compiled", _get_jinja()(self.prompt_template))
+        return self._compiled
+
+def _context_key(context: Mapping[str, Any] | None) -> tuple | None:
+    """Hashable, order-independent key for a render context, or None if unhashable."""
+    if not context:
+        return ()
+    key = tuple(sorted(context.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+@lru_cache(maxsize=256)
+def _render_jinja(definition: AgentDefinition, key: tuple) -> str:
+    return definition._template().render(**dict(key))
 
 @dataclass
 class Task:
@@ -40,6 +143,16 @@ class AgentResult:
     cost_usd: float = 0.0
     tokens_used: int = 0
     turns_used: int = 0
+    cached_tokens: int = 0  # input tokens served from the provider's prompt cache
+    input_tokens: int = 0
+    output_tokens: int = 0
+    
+    def token_split(self) -> tuple[int, int]:
+        """(input, output) tokens, halving tokens_used if no split was reported."""
+        if self.input_tokens or self.output_tokens:
+            return self.input_tokens, self.output_tokens
+        half = self.tokens_used // 2
+        return half, half
 
 class BaseAgent(ABC):
     def __init__(self, definition: AgentDefinition):
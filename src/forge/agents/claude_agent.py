@@ -1,20 +1,183 @@
 """Claude Agent SDK Integration - FIXED for proper message handling"""
 import asyncio
 import logging
+import re
+from collections import ChainMap, OrderedDict, deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from io import StringIO
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from forge.agents.base import AgentDefinition, AgentResult, BaseAgent, Task
-from forge.config.settings import ForgeSettings
+from forge.agents.base import ANALYSIS_INSTRUCTIONS, AgentDefinition, AgentResult, BaseAgent, Task
+from forge.config.settings import ForgeSettings, get_settings
 
 logger = logging.getLogger(__name__)
 
-try:
-    from claude_agent_sdk import query, ClaudeAgentOptions
-    SDK_AVAILABLE = True
-except ImportError:
-    SDK_AVAILABLE = False
-    logger.warning("Claude Agent SDK not available")
+
+@lru_cache(maxsize=1)
+def _load_sdk() -> tuple[Callable, type] | None:
+    """Import the Claude Agent SDK on first use; None if it isn't installed."""
+    try:
+        from claude_agent_sdk import query, ClaudeAgentOptions
+    except ImportError:
+        logger.warning("Claude Agent SDK not available")
+        return None
+    return query, ClaudeAgentOptions
+
+
+# Fallback per-1K-token rates by model family, for when the SDK reports
+# tokens but no cost
+_FAMILY_RATES = {"opus": 0.015, "sonnet": 0.003, "haiku": 0.0008}
+_DEFAULT_RATE = 0.003
+_MODEL_FAMILY = re.compile(r"opus|sonnet|haiku", re.IGNORECASE)
+
+
+@lru_cache(maxsize=32)
+def _fallback_rate(model: str) -> float:
+    """Look up the fallback per-1K rate for a model name."""
+    match = _MODEL_FAMILY.search(model)
+    return _FAMILY_RATES[match.group().lower()] if match else _DEFAULT_RATE
+
+
+# How much streamed text a sink-fed agent still keeps for its result, so the
+# result isn't empty and token estimates don't drop to zero
+_STREAM_TAIL_CHARS = 32_000
+
+
+@dataclass
+class _StreamState:
+    """Output and usage accumulated while streaming SDK messages."""
+    buf: StringIO = field(default_factory=StringIO)
+    wrote: bool = False
+    total_cost: float = 0.0
+    total_tokens: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    turns_used: int = 0
+    max_turns_hit: bool = False
+    sink: Callable[[str], None] | None = None
+    tail: deque[str] = field(default_factory=deque)
+    tail_chars: int = 0
+    
+    def emit(self, text: str):
+        """Append a text block to the output, newline-separated.
+        
+        With a sink, blocks are handed over as they arrive and only the last
+        _STREAM_TAIL_CHARS characters of them are kept.
+        """
+        if not text:
+            return
+        if self.sink is not None:
+            self.sink(text)
+            self._keep_tail(text)
+        else:
+            if self.wrote:
+                self.buf.write("\n")
+            self.buf.write(text)
+        self.wrote = True
+    
+    def _keep_tail(self, text: str):
+        """Add a block to the bounded tail, dropping the oldest blocks."""
+        self.tail.append(text)
+        self.tail_chars += len(text)
+        while self.tail_chars > _STREAM_TAIL_CHARS and len(self.tail) > 1:
+            self.tail_chars -= len(self.tail.popleft())
+        if self.tail_chars > _STREAM_TAIL_CHARS:
+            self.tail[0] = self.tail[0][-_STREAM_TAIL_CHARS:]
+            self.tail_chars = _STREAM_TAIL_CHARS
+    
+    def output(self) -> str:
+        """The accumulated output (just the tail when streaming to a sink)."""
+        if self.sink is not None:
+            return "\n".join(self.tail)
+        return self.buf.getvalue()
+
+
+def _usage_tokens(usage: Any) -> tuple[int, int]:
+    """Read (input, output) tokens from a dict or object usage payload."""
+    if isinstance(usage, dict):
+        return usage.get('input_tokens', 0), usage.get('output_tokens', 0)
+    try:
+        return usage.input_tokens, usage.output_tokens
+    except AttributeError:
+        return getattr(usage, 'input_tokens', 0), getattr(usage, 'output_tokens', 0)
+
+
+def _handle_system(message: Any, state: _StreamState):
+    """System/init messages carry nothing we report."""
+
+
+def _handle_other(message: Any, state: _StreamState):
+    """Any other message only counts as a turn."""
+    state.turns_used += 1
+
+
+def _handle_assistant(message: Any, state: _StreamState):
+    """Extract text content from an assistant message."""
+    state.turns_used += 1
+    content = message.content
+    if isinstance(content, str):
+        state.emit(content)
+        return
+    for item in content or ():
+        # TextBlock is by far the most common block; check it by identity
+        if type(item) is _TEXT_BLOCK:
+            state.emit(item.text)
+        elif isinstance(item, dict) and item.get('type') == 'text':
+            state.emit(item.get('text', ''))
+
+
+def _handle_result(message: Any, state: _StreamState):
+    """Extract cost and usage from the final result message."""
+    state.turns_used += 1
+    if message.total_cost_usd:
+        state.total_cost = message.total_cost_usd
+    
+    usage = message.usage
+    if usage:
+        state.input_tokens, state.output_tokens = _usage_tokens(usage)
+        state.total_tokens = state.input_tokens + state.output_tokens
+    
+    # Reported after the stream ends so the consumer never blocks on logging
+    if message.subtype == 'error_max_turns':
+        state.max_turns_hit = True
+
+
+_HANDLERS: dict[type, Callable[[Any, _StreamState], None]] | None = None
+_TEXT_BLOCK: type | None = None
+
+
+def _get_handlers() -> dict[type, Callable[[Any, _StreamState], None]]:
+    """Map SDK message classes to their handlers, resolved on first use."""
+    global _HANDLERS, _TEXT_BLOCK
+    if _HANDLERS is None:
+        from claude_agent_sdk import AssistantMessage, ResultMessage, SystemMessage, TextBlock
+        _TEXT_BLOCK = TextBlock
+        _HANDLERS = {
+            AssistantMessage: _handle_assistant,
+            ResultMessage: _handle_result,
+            SystemMessage: _handle_system,
+        }
+    return _HANDLERS
+
+
+# Read-only tools for definitions that don't list any
+_DEFAULT_TOOLS = ("Read", "Glob", "Grep")
+
+
+@lru_cache(maxsize=64)
+def _build_options(definition: AgentDefinition, cwd: str) -> "ClaudeAgentOptions":
+    """Build SDK options once per (definition, working dir) pair."""
+    _, options_cls = _load_sdk()
+    return options_cls(
+        system_prompt=definition.static_prompt or definition.prompt_template or "",
+        allowed_tools=list(definition.tools or _DEFAULT_TOOLS),
+        max_turns=definition.max_turns,
+        cwd=cwd,
+        permission_mode="acceptEdits",
+        model=definition.model,
+    )
 
 
 class ClaudeAgent(BaseAgent):
@@ -25,40 +188,39 @@ class ClaudeAgent(BaseAgent):
         definition: AgentDefinition,
         settings: ForgeSettings | None = None,
         working_dir: Path | None = None,
+        on_delta: Callable[[str], None] | None = None,
     ):
         super().__init__(definition)
-        self.settings = settings or ForgeSettings()
+        self.settings = settings or get_settings()
         self.working_dir = working_dir or Path.cwd()
+        self._cwd_str = str(self.working_dir)
+        # Receives each text block as it streams in; only a bounded tail of the
+        # output is kept for the result then
+        self.on_delta = on_delta
+        self._cost_per_1k = _fallback_rate(definition.model)
+        # Everything after the task description is fixed for this agent
+        self._static_trailer = f"\n\n## Working Directory\n{self._cwd_str}\n\n{ANALYSIS_INSTRUCTIONS}"
     
     def _build_prompt(self, task: Task) -> str:
         """Build the full prompt for the agent."""
-        context = task.context.copy()
-        context["task"] = task.description
-        context["working_dir"] = str(self.working_dir)
+        if self.definition.static_prompt is not None:
+            # The role text already goes out as the system prompt; only send
+            # the per-task part (plus any extra context the caller supplied).
+            extra = task.context.get("context")
+            head = f"{extra}\n\n" if extra else ""
+            return f"{head}## Current Task\n{task.description}{self._static_trailer}"
+        
+        # Overlay the per-task keys instead of copying task.context
+        context = ChainMap({"task": task.description, "working_dir": self._cwd_str}, task.context)
         
         base_prompt = self.definition.render_prompt(context)
         
-        return f"""{base_prompt}
-
-## Current Task
-{task.description}
-
-## Working Directory
-{self.working_dir}
-
-## Instructions
-1. Analyze the codebase thoroughly
-2. Identify issues based on your focus areas
-3. Provide detailed findings with file locations and line numbers
-4. Suggest specific fixes for each issue
-5. Prioritize issues by severity (critical, high, medium, low)
-
-When you are done analyzing, provide a clear summary of your findings.
-"""
+        return f"{base_prompt}\n\n## Current Task\n{task.description}{self._static_trailer}"
     
     async def execute(self, task: Task) -> AgentResult:
         """Execute a task using the Claude Agent SDK."""
-        if not SDK_AVAILABLE:
+        sdk = _load_sdk()
+        if sdk is None:
             return AgentResult(
                 success=False,
                 output="",
@@ -67,113 +229,79 @@ When you are done analyzing, provide a clear summary of your findings.
         
         prompt = self._build_prompt(task)
         
-        options = ClaudeAgentOptions(
-            system_prompt=self.definition.prompt_template or "",
-            allowed_tools=self.definition.tools or ["Read", "Glob", "Grep"],
-            max_turns=self.definition.max_turns,
-            cwd=str(self.working_dir),
-            permission_mode="acceptEdits",
-            model=self.definition.model,
-        )
+        query = sdk[0]
+        options = _build_options(self.definition, self._cwd_str)
         
-        output_parts = []
-        total_cost = 0.0
-        total_tokens = 0
-        turns_used = 0
+        state = _StreamState(sink=self.on_delta)
+        handlers = _get_handlers()
         
         try:
             async for message in query(prompt=prompt, options=options):
-                msg_type = type(message).__name__
-                
-                # Skip system/init messages
-                if msg_type == 'SystemMessage':
-                    continue
-                
-                turns_used += 1
-                
-                # Extract content from assistant messages
-                if msg_type == 'AssistantMessage':
-                    content = getattr(message, 'content', None)
-                    if content:
-                        if isinstance(content, list):
-                            for item in content:
-                                # Handle TextBlock
-                                if hasattr(item, 'text'):
-                                    text = getattr(item, 'text', '')
-                                    if text:
-                                        output_parts.append(text)
-                                elif isinstance(item, dict) and item.get('type') == 'text':
-                                    output_parts.append(item.get('text', ''))
-                        elif isinstance(content, str):
-                            output_parts.append(content)
-                
-                # Handle ResultMessage - extract cost info
-                if msg_type == 'ResultMessage':
-                    # Extract cost from result message
-                    result_cost = getattr(message, 'total_cost_usd', 0.0)
-                    if result_cost:
-                        total_cost = result_cost
-                    
-                    # Extract usage info
-                    usage = getattr(message, 'usage', None)
-                    if usage:
-                        if isinstance(usage, dict):
-                            total_tokens = usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
-                        else:
-                            total_tokens = getattr(usage, 'input_tokens', 0) + getattr(usage, 'output_tokens', 0)
-                    
-                    # Check if it was a max_turns termination (still consider it success if we have output)
-                    subtype = getattr(message, 'subtype', '')
-                    if subtype == 'error_max_turns' and output_parts:
-                        self.logger.warning("Max turns reached, but returning partial results")
-                
-                # Safely extract usage/cost info from other messages
-                usage = getattr(message, 'usage', None)
-                if usage and not total_tokens:
-                    if isinstance(usage, dict):
-                        total_tokens = usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
-                    else:
-                        input_tokens = getattr(usage, 'input_tokens', 0)
-                        output_tokens = getattr(usage, 'output_tokens', 0)
-                        total_tokens = input_tokens + output_tokens
-                    
+                handlers.get(type(message), _handle_other)(message, state)
         except GeneratorExit:
             pass
         except Exception as e:
             error_msg = str(e)
             # Don't treat async cleanup errors as fatal if we have output
-            if output_parts and ("cancel scope" in error_msg or "has no attribute" in error_msg):
+            if state.wrote and ("cancel scope" in error_msg or "has no attribute" in error_msg):
                 self.logger.warning(f"Non-fatal SDK cleanup: {error_msg}")
             else:
                 self.logger.error(f"Agent execution failed: {e}")
                 return AgentResult(
                     success=False,
-                    output="\n".join(output_parts) if output_parts else "",
+                    output=state.output(),
                     error=error_msg,
                 )
         
-        output = "\n".join(output_parts)
+        # Max-turns termination still counts as success if we have output
+        if state.max_turns_hit and state.wrote:
+            self.logger.warning("Max turns reached, but returning partial results")
+        
+        output = state.output()
+        total_cost = state.total_cost
+        total_tokens = state.total_tokens
         
         # Estimate cost if not provided
         if not total_cost and total_tokens:
-            model = self.definition.model
-            if "opus" in model.lower():
-                cost_per_1k = 0.015
-            elif "sonnet" in model.lower():
-                cost_per_1k = 0.003
-            else:
-                cost_per_1k = 0.003
-            total_cost = (total_tokens / 1000) * cost_per_1k
+            total_cost = (total_tokens / 1000) * self._cost_per_1k
         
         return AgentResult(
-            success=bool(output),
+            success=state.wrote,
             output=output,
             cost_usd=total_cost,
             tokens_used=total_tokens,
-            turns_used=turns_used,
+            turns_used=state.turns_used,
+            input_tokens=state.input_tokens,
+            output_tokens=state.output_tokens,
         )
 
 
+# Process-wide agent instances. A ClaudeAgent keeps no state between
+# execute() calls, so callers with the same definition, settings object and
+# working dir can share one. Cached agents hold a reference to their settings,
+# so the id() in the key can't be reused while the entry exists.
+_SHARED_AGENTS: OrderedDict[tuple[AgentDefinition, int, str], ClaudeAgent] = OrderedDict()
+_SHARED_AGENTS_MAX = 64
+
+
+def shared_agent(
+    definition: AgentDefinition,
+    settings: ForgeSettings,
+    working_dir: Path,
+) -> ClaudeAgent:
+    """Get the shared ClaudeAgent for these arguments, creating it if needed."""
+    key = (definition, id(settings), str(working_dir))
+    agent = _SHARED_AGENTS.get(key)
+    if agent is None:
+        agent = ClaudeAgent(definition=definition, settings=settings, working_dir=working_dir)
+        _SHARED_AGENTS[key] = agent
+        if len(_SHARED_AGENTS) > _SHARED_AGENTS_MAX:
+            _SHARED_AGENTS.popitem(last=False)
+    else:
+        _SHARED_AGENTS.move_to_end(key)
+    return agent
+
+
 class ClaudeAgentWithClient(ClaudeAgent):
     """Extended Claude Agent with custom tools and hooks."""
     
@@ -5,14 +5,72 @@ This provides more control and avoids SDK-related hangs.
 import asyncio
 import logging
 import os
+import weakref
+from collections import ChainMap
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from io import StringIO
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
 
-from forge.agents.base import AgentDefinition, AgentResult, BaseAgent, Task
-from forge.config.settings import ForgeSettings
+from forge.agents.base import ANALYSIS_INSTRUCTIONS, AgentDefinition, AgentResult, BaseAgent, Task
+from forge.config.settings import ForgeSettings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Anthropic ignores cache breakpoints on prefixes shorter than this
+_MIN_CACHEABLE_TOKENS = 1024
+
+# Per-1K-token rates used by DirectLLMAgent._estimate_cost
+_PROVIDER_RATES = {
+    "claude": 0.003,  # sonnet
+    "openai": 0.005,  # gpt-4o
+    "gemini": 0.001,
+    "grok": 0.005,
+}
+
+# Cached-input price as a fraction of the base input rate
+_CACHE_READ_RATES = {
+    "claude": 0.1,
+    "openai": 0.5,
+    "grok": 0.25,
+}
+
+# One keep-alive connection pool per event loop, shared by every agent's
+# Anthropic/OpenAI/Grok client (httpx pools can't be used across loops)
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_genai_configured = False
+
+
+def _shared_http_client():
+    """Get the pooled httpx client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        import httpx
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+        _HTTP_CLIENTS[loop] = client
+    return client
+
+
+def _configure_genai():
+    """Configure google.generativeai once per process."""
+    global _genai_configured
+    import google.generativeai as genai
+    if not _genai_configured:
+        genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+        _genai_configured = True
+    return genai
+
+
+@lru_cache(maxsize=16)
+def _gemini_model(model_name: str):
+    """Build a GenerativeModel once per model name."""
+    return _configure_genai().GenerativeModel(model_name)
+
 
 class DirectLLMAgent(BaseAgent):
     """
@@ -26,68 +84,80 @@ class DirectLLMAgent(BaseAgent):
         settings: ForgeSettings | None = None,
         working_dir: Path | None = None,
         llm_provider: str = "claude",  # claude, openai, gemini, grok
+        on_delta: Callable[[str], None] | None = None,
     ):
         super().__init__(definition)
-        self.settings = settings or ForgeSettings()
+        self.settings = settings or get_settings()
         self.working_dir = working_dir or Path.cwd()
+        self._cwd_str = str(self.working_dir)
         self.llm_provider = llm_provider
-        self._client = None
+        # Called with each text chunk as Claude/OpenAI/Grok responses stream in
+        self.on_delta = on_delta
+        # Prompt pieces that don't change between tasks
+        self._trailer = f"\n\n## Working Directory\n{self._cwd_str}\n\n{ANALYSIS_INSTRUCTIONS}"
+        static_prompt = definition.static_prompt
+        self._static_prefix = (
+            f"{static_prompt}\n\n{ANALYSIS_INSTRUCTIONS}" if static_prompt is not None else ""
+        )
+        # One SDK client per event loop, like the HTTP pools they sit on
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
     
     def _get_client(self):
-        """Get or create the appropriate LLM client."""
-        if self._client:
-            return self._client
+        """Get or create the appropriate async LLM client for the running event loop.
         
+        Provider SDKs are imported here, on first use, so only the ones in
+        use are ever loaded. HTTP clients share that loop's connection pool,
+        so a later asyncio.run() gets a new client rather than one bound to
+        a closed loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = self._new_client()
+        return client
+    
+    def _new_client(self):
         if self.llm_provider == "claude":
             import anthropic
-            self._client = anthropic.Anthropic(
-                api_key=os.environ.get("ANTHROPIC_API_KEY")
+            return anthropic.AsyncAnthropic(
+                api_key=os.environ.get("ANTHROPIC_API_KEY"),
+                http_client=_shared_http_client(),
             )
         elif self.llm_provider == "openai":
             import openai
-            self._client = openai.OpenAI(
+            return openai.AsyncOpenAI(
                 api_key=os.environ.get("OPENAI_API_KEY"),
-                base_url=os.environ.get("OPENAI_API_BASE")
+                base_url=os.environ.get("OPENAI_API_BASE"),
+                http_client=_shared_http_client(),
             )
         elif self.llm_provider == "gemini":
-            import google.generativeai as genai
-            genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-            self._client = genai
+            return _configure_genai()
         elif self.llm_provider == "grok":
             # Grok uses OpenAI-compatible API
             import openai
-            self._client = openai.OpenAI(
+            return openai.AsyncOpenAI(
                 api_key=os.environ.get("XAI_API_KEY"),
-                base_url="https://api.x.ai/v1"
+                base_url="https://api.x.ai/v1",
+                http_client=_shared_http_client(),
             )
+        return None
+    
+    def _build_prompt_parts(self, task: Task) -> tuple[str, str]:
+        """Split the prompt into a stable, cacheable prefix and the per-task suffix."""
+        if self.definition.static_prompt is None:
+            # The template depends on the task, so no prefix is stable
+            context = ChainMap({"task": task.description, "working_dir": self._cwd_str}, task.context)
+            base_prompt = self.definition.render_prompt(context)
+            return "", f"{base_prompt}\n\n## Current Task\n{task.description}{self._trailer}"
         
-        return self._client
+        extra = task.context.get("context")
+        head = f"{extra}\n\n" if extra else ""
+        return self._static_prefix, f"\n{head}## Current Task\n{task.description}\n\n## Working Directory\n{self._cwd_str}\n"
     
     def _build_prompt(self, task: Task) -> str:
         """Build the full prompt for the agent."""
-        context = task.context.copy()
-        context["task"] = task.description
-        context["working_dir"] = str(self.working_dir)
-        
-        base_prompt = self.definition.render_prompt(context)
-        
-        return f"""{base_prompt}
-
-## Current Task
-{task.description}
-
-## Working Directory
-{self.working_dir}
-
-## Instructions
-1. Analyze the codebase thoroughly
-2. Identify issues based on your focus areas
-3. Provide detailed findings with file locations and line numbers
-4. Suggest specific fixes for each issue
-5. Prioritize issues by severity (critical, high, medium, low)
-
-When you are done analyzing, provide a clear summary of your findings.
-"""
+        prefix, suffix = self._build_prompt_parts(task)
+        return prefix + suffix
     
     def _get_model_name(self) -> str:
         """Get the appropriate model name for the provider."""
@@ -101,56 +171,108 @@ When you are done analyzing, provide a clear summary of your findings.
             return "grok-3"
         return self.definition.model
     
+    def _claude_params(self, prefix: str, suffix: str) -> dict[str, Any]:
+        """Build Messages API arguments, marking a long enough prefix as cacheable."""
+        if len(prefix) // 4 >= _MIN_CACHEABLE_TOKENS:
+            content = [
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": suffix},
+            ]
+        else:
+            content = prefix + suffix
+        return {
+            "model": self._get_model_name(),
+            "max_tokens": 4096,
+            "messages": [{"role": "user", "content": content}],
+        }
+    
+    def _claude_result(self, response: Any, discount: float = 1.0) -> AgentResult:
+        """Build a result, with usage and cost, from a Claude message."""
+        usage = response.usage
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        input_tokens = usage.input_tokens + cache_read + cache_write
+        uncached = usage.input_tokens + usage.output_tokens
+        return AgentResult(
+            success=True,
+            output=response.content[0].text,
+            cost_usd=self._estimate_cost(uncached, "claude", cache_read, cache_write) * discount,
+            tokens_used=input_tokens + usage.output_tokens,
+            turns_used=1,
+            input_tokens=input_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=cache_read,
+        )
+    
+    def _chat_result(self, output: str, usage: Any) -> AgentResult:
+        """Build a result from OpenAI-compatible output and usage."""
+        if not usage:
+            return AgentResult(success=True, output=output, turns_used=1)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+        tokens = usage.total_tokens
+        return AgentResult(
+            success=True,
+            output=output,
+            cost_usd=self._estimate_cost(tokens - cached, self.llm_provider, cached),
+            tokens_used=tokens,
+            turns_used=1,
+            input_tokens=usage.prompt_tokens,
+            output_tokens=usage.completion_tokens,
+            cached_tokens=cached,
+        )
+    
+    async def _stream_chat(self, client: Any, prompt: str) -> tuple[str, Any]:
+        """Stream an OpenAI-compatible chat completion; return (text, usage)."""
+        stream = await client.chat.completions.create(
+            model=self._get_model_name(),
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=4096,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        buf = StringIO()
+        usage = None
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                buf.write(text)
+                if self.on_delta:
+                    self.on_delta(text)
+        return buf.getvalue(), usage
+    
     async def execute(self, task: Task) -> AgentResult:
         """Execute a task using direct API calls."""
-        prompt = self._build_prompt(task)
+        # Stable prefix first, so provider-side prefix caching can kick in
+        prefix, suffix = self._build_prompt_parts(task)
+        prompt = prefix + suffix
         client = self._get_client()
         
         try:
             if self.llm_provider == "claude":
-                response = client.messages.create(
-                    model=self._get_model_name(),
-                    max_tokens=4096,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                output = response.content[0].text
-                tokens = response.usage.input_tokens + response.usage.output_tokens
-                cost = self._estimate_cost(tokens, "claude")
+                async with client.messages.stream(**self._claude_params(prefix, suffix)) as stream:
+                    if self.on_delta:
+                        async for text in stream.text_stream:
+                            self.on_delta(text)
+                    response = await stream.get_final_message()
+                return self._claude_result(response)
                 
-            elif self.llm_provider == "openai":
-                response = client.chat.completions.create(
-                    model=self._get_model_name(),
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=4096
-                )
-                output = response.choices[0].message.content
-                tokens = response.usage.total_tokens
-                cost = self._estimate_cost(tokens, "openai")
+            elif self.llm_provider in ("openai", "grok"):
+                return self._chat_result(*await self._stream_chat(client, prompt))
                 
             elif self.llm_provider == "gemini":
-                model = client.GenerativeModel(self._get_model_name())
-                response = model.generate_content(prompt)
-                output = response.text
-                tokens = 0  # Gemini doesn't always return token count
-                cost = 0.01  # Estimate
-                
-            elif self.llm_provider == "grok":
-                response = client.chat.completions.create(
-                    model=self._get_model_name(),
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=4096
+                model = _gemini_model(self._get_model_name())
+                response = await model.generate_content_async(prompt)
+                return AgentResult(
+                    success=True,
+                    output=response.text,
+                    cost_usd=0.01,  # Estimate; Gemini doesn't always return token count
+                    turns_used=1,
                 )
-                output = response.choices[0].message.content
-                tokens = response.usage.total_tokens if response.usage else 0
-                cost = self._estimate_cost(tokens, "grok")
-            
-            return AgentResult(
-                success=True,
-                output=output,
-                cost_usd=cost,
-                tokens_used=tokens,
-                turns_used=1,
-            )
             
         except Exception as e:
             logger.error(f"Agent execution failed: {e}")
@@ -160,21 +282,188 @@ When you are done analyzing, provide a clear summary of your findings.
                 error=str(e),
             )
     
-    def _estimate_cost(self, tokens: int, provider: str) -> float:
-        """Estimate cost based on tokens and provider."""
-        rates = {
-            "claude": 0.003,  # per 1K tokens (sonnet)
-            "openai": 0.005,  # per 1K tokens (gpt-4o)
-            "gemini": 0.001,  # per 1K tokens
-            "grok": 0.005,    # per 1K tokens
-        }
-        return (tokens / 1000) * rates.get(provider, 0.003)
+    def _estimate_cost(
+        self,
+        tokens: int,
+        provider: str,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> float:
+        """Estimate cost based on tokens and provider.
+        
+        ``tokens`` excludes cached input. Cache reads are billed at the
+        provider's discounted rate and Anthropic cache writes at 125%.
+        """
+        cache_rate = _CACHE_READ_RATES.get(provider, 1.0)
+        billed = tokens + cache_rate * cache_read_tokens + 1.25 * cache_write_tokens
+        return (billed / 1000) * _PROVIDER_RATES.get(provider, 0.003)
+
+
+async def run_message_batch(
+    client: Any,
+    requests: list[dict[str, Any]],
+    poll_interval: float = 5.0,
+    max_poll_interval: float | None = None,
+) -> dict[str, Any]:
+    """Submit a Claude Message Batch, wait for it to end, and map custom_id -> result.
+    
+    The poll interval doubles after each check, up to ``max_poll_interval``
+    (by default it stays fixed).
+    """
+    max_poll_interval = max_poll_interval or poll_interval
+    batch = await client.messages.batches.create(requests=requests)
+    while batch.processing_status != "ended":
+        await asyncio.sleep(poll_interval)
+        poll_interval = min(2 * poll_interval, max_poll_interval)
+        batch = await client.messages.batches.retrieve(batch.id)
+    results = {}
+    async for entry in await client.messages.batches.results(batch.id):
+        results[entry.custom_id] = entry.result
+    return results
+
+
+def _batch_entry_result(agent: DirectLLMAgent, result: Any, error: str | None) -> AgentResult:
+    """Turn one Message Batch result entry into an AgentResult."""
+    if result is not None and result.type == "succeeded":
+        return agent._claude_result(result.message, discount=0.5)
+    return AgentResult(
+        success=False,
+        output="",
+        error=error or f"Batch request {result.type if result else 'missing'}",
+    )
+
+
+async def execute_batch(
+    jobs: list[tuple[AgentDefinition, Task]],
+    settings: ForgeSettings | None = None,
+    working_dir: Path | None = None,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 60.0,
+) -> list[AgentResult]:
+    """Run (definition, task) pairs as one Claude Message Batch, at half price.
+    
+    Each request is a single Messages API turn, so agents get no tool use.
+    Results come back in job order.
+    """
+    if not jobs:
+        return []
+    agents: dict[AgentDefinition, DirectLLMAgent] = {}
+    requests = []
+    for i, (definition, task) in enumerate(jobs):
+        agent = agents.get(definition)
+        if agent is None:
+            agent = agents[definition] = DirectLLMAgent(
+                definition=definition,
+                settings=settings,
+                working_dir=working_dir,
+                llm_provider="claude",
+            )
+        requests.append({"custom_id": str(i), "params": agent._claude_params(*agent._build_prompt_parts(task))})
+    
+    client = next(iter(agents.values()))._get_client()
+    try:
+        results = await run_message_batch(client, requests, poll_interval, max_poll_interval)
+        error = None
+    except Exception as e:
+        logger.error(f"Batch request failed: {e}")
+        results = {}
+        error = str(e)
+    return [
+        _batch_entry_result(agents[definition], results.get(str(i)), error)
+        for i, (definition, _) in enumerate(jobs)
+    ]
+
+
+# Anthropic expires a Message Batch that hasn't ended after 24 hours
+BATCH_TIMEOUT = 24 * 60 * 60
+
+
+class RequestBatcher:
+    """
+    Coalesces Claude requests from concurrent tasks into Message Batches.
+    
+    Requests submitted within ``window_ms`` of each other (up to
+    ``max_batch_size``) are sent as one batch, which Anthropic bills at half
+    price. Batches finish asynchronously -- often minutes later -- so this
+    suits bulk runs such as persona testing, not interactive ones.
+    """
+    
+    def __init__(
+        self,
+        agent: DirectLLMAgent,
+        window_ms: int = 50,
+        max_batch_size: int = 100,
+        poll_interval: float = 5.0,
+    ):
+        self.agent = agent
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.poll_interval = poll_interval
+        self._queue: asyncio.Queue | None = None
+        self._drainer: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+    
+    async def submit(self, task: Task) -> AgentResult:
+        """Queue a task for the next batch and wait for its result."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((task, fut))
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain())
+        return await fut
+    
+    async def _drain(self):
+        """Group queued requests into batches until the queue is empty."""
+        while not self._queue.empty():
+            pending = [self._queue.get_nowait()]
+            self._take_queued(pending)
+            if len(pending) < self.max_batch_size:
+                # Let the window fill, then take what arrived. Items are only
+                # ever taken with get_nowait, which can't lose one the way a
+                # cancelled get() can on Python < 3.12.
+                await asyncio.sleep(self.window)
+                self._take_queued(pending)
+            # Don't hold the next window hostage to this batch's completion
+            batch_task = asyncio.create_task(self._run_batch(pending))
+            self._inflight.add(batch_task)
+            batch_task.add_done_callback(self._inflight.discard)
+    
+    def _take_queued(self, pending: list[tuple[Task, asyncio.Future]]):
+        """Move queued requests into pending, up to max_batch_size."""
+        while len(pending) < self.max_batch_size and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+    
+    async def _run_batch(self, pending: list[tuple[Task, asyncio.Future]]):
+        """Submit one batch, wait for it to end, and resolve each caller."""
+        agent = self.agent
+        client = agent._get_client()
+        requests = [
+            {"custom_id": str(i), "params": agent._claude_params(*agent._build_prompt_parts(task))}
+            for i, (task, _) in enumerate(pending)
+        ]
+        try:
+            results = await run_message_batch(client, requests, self.poll_interval)
+        except Exception as e:
+            logger.error(f"Batch request failed: {e}")
+            results = {}
+            error = str(e)
+        else:
+            error = None
+        
+        for i, (_, fut) in enumerate(pending):
+            if not fut.done():  # caller may have timed out or been cancelled
+                fut.set_result(_batch_entry_result(agent, results.get(str(i)), error))
 
 
 class MultiLLMOrchestrator:
     """
     Orchestrator that runs the same task across multiple LLMs
     and synthesizes the results.
+    
+    At most ``max_concurrent`` provider calls run at once across every task
+    this orchestrator is handling, and each provider gets an equal share of
+    those slots so one slow endpoint can't hold all of them.
     """
     
     def __init__(
@@ -183,9 +472,11 @@ class MultiLLMOrchestrator:
         settings: ForgeSettings | None = None,
         working_dir: Path | None = None,
         providers: list[str] = None,
+        batch: bool = False,
+        max_concurrent: int = 8,
     ):
         self.definition = definition
-        self.settings = settings or ForgeSettings()
+        self.settings = settings or get_settings()
         self.working_dir = working_dir or Path.cwd()
         self.providers = providers or ["claude", "openai", "gemini", "grok"]
         self.agents = {}
@@ -197,23 +488,57 @@ class MultiLLMOrchestrator:
                 working_dir=working_dir,
                 llm_provider=provider,
             )
+        
+        # Opt-in batching for bulk runs; only Claude's batch API is wired up
+        self.batchers = {}
+        if batch and "claude" in self.agents:
+            self.batchers["claude"] = RequestBatcher(self.agents["claude"])
+        
+        self._sem = asyncio.Semaphore(max_concurrent)
+        per_provider = max(1, max_concurrent // len(self.providers))
+        self._provider_sems = {p: asyncio.Semaphore(per_provider) for p in self.providers}
     
-    async def execute_all(self, task: Task, timeout: int = 120) -> dict[str, AgentResult]:
-        """Execute task across all providers in parallel."""
-        results = {}
+    @asynccontextmanager
+    async def _slot(self, provider: str):
+        """Hold a provider slot and a global slot while a call runs."""
+        if provider in self.batchers:
+            # Batched requests wait on the batch, not on a live connection
+            yield
+            return
+        async with self._provider_sems[provider], self._sem:
+            yield
+    
+    def _submit(self, provider: str, task: Task):
+        """Route a task through the provider's batcher if it has one."""
+        batcher = self.batchers.get(provider)
+        if batcher is not None:
+            return batcher.submit(task)
+        return self.agents[provider].execute(task)
+    
+    async def iter_results(
+        self, task: Task, timeout: int = 120, batch_timeout: float | None = BATCH_TIMEOUT
+    ) -> AsyncIterator[tuple[str, AgentResult]]:
+        """Run the task across all providers, yielding each result as it finishes.
         
+        Batched providers are held to ``batch_timeout`` rather than
+        ``timeout``, since a Message Batch usually takes minutes or longer;
+        None waits for the batch however long it takes.
+        """
         async def run_agent(provider: str):
+            limit = batch_timeout if provider in self.batchers else timeout
             try:
-                result = await asyncio.wait_for(
-                    self.agents[provider].execute(task),
-                    timeout=timeout
-                )
+                # Time spent waiting for a slot doesn't count against the timeout
+                async with self._slot(provider):
+                    result = await asyncio.wait_for(
+                        self._submit(provider, task),
+                        timeout=limit
+                    )
                 return provider, result
             except asyncio.TimeoutError:
                 return provider, AgentResult(
                     success=False,
                     output="",
-                    error=f"Timeout after {timeout}s"
+                    error=f"Timeout after {limit}s"
                 )
             except Exception as e:
                 return provider, AgentResult(
@@ -222,23 +547,31 @@ class MultiLLMOrchestrator:
                     error=str(e)
                 )
         
-        tasks = [run_agent(p) for p in self.providers]
-        completed = await asyncio.gather(*tasks)
-        
-        for provider, result in completed:
-            results[provider] = result
-        
-        return results
+        tasks = [asyncio.ensure_future(run_agent(p)) for p in self.providers]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            # The caller may stop early; don't leave provider calls running
+            for t in tasks:
+                t.cancel()
+    
+    async def execute_all(
+        self, task: Task, timeout: int = 120, batch_timeout: float | None = BATCH_TIMEOUT
+    ) -> dict[str, AgentResult]:
+        """Execute task across all providers in parallel."""
+        completed = {provider: result async for provider, result in self.iter_results(task, timeout, batch_timeout)}
+        # Keep the configured provider order regardless of finish order
+        return {p: completed[p] for p in self.providers}
     
     def synthesize_results(self, results: dict[str, AgentResult]) -> str:
         """Synthesize results from multiple LLMs into a unified report."""
-        synthesis = ["# Multi-LLM Analysis Synthesis\n"]
-        
-        for provider, result in results.items():
-            synthesis.append(f"\n## {provider.upper()} Analysis\n")
-            if result.success:
-                synthesis.append(result.output)
-            else:
-                synthesis.append(f"*Error: {result.error}*")
-        
-        return "\n".join(synthesis)
+        return "\n".join(_synthesis_sections(results))
+
+
+def _synthesis_sections(results: dict[str, AgentResult]) -> Iterator[str]:
+    """Yield the report header, then a heading and body per provider."""
+    yield "# Multi-LLM Analysis Synthesis\n"
+    for provider, result in results.items():
+        yield f"\n## {provider.upper()} Analysis\n"
+        yield result.output if result.success else f"*Error: {result.error}*"
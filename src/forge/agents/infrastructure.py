@@ -1,8 +1,10 @@
 """AI/Data Infrastructure Specialist Agents"""
+from types import MappingProxyType
+
 from forge.agents.base import AgentDefinition
 
-# Infrastructure Agents
-INFRASTRUCTURE_AGENTS = {
+# Infrastructure Agents (read-only view)
+INFRASTRUCTURE_AGENTS = MappingProxyType({
     "graph_architect": AgentDefinition(
         name="graph_architect",
         description="Designs and optimizes Neo4j knowledge graphs, Cypher queries, and graph data models for complex relationship-heavy domains.",
@@ -25,7 +27,7 @@ When analyzing a project:
 
 Provide concrete schema designs and query examples.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "Glob", "Grep"],
+        tools=("Read", "Write", "Bash", "Glob", "Grep"),
     ),
     
     "chunking_strategist": AgentDefinition(
@@ -51,7 +53,7 @@ When analyzing documents or codebases:
 
 Always consider the downstream retrieval and generation quality.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "Glob"],
+        tools=("Read", "Write", "Bash", "Glob"),
     ),
     
     "embedding_architect": AgentDefinition(
@@ -77,7 +79,7 @@ When designing embedding solutions:
 
 Provide concrete recommendations with implementation code.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "WebSearch"],
+        tools=("Read", "Write", "Bash", "WebSearch"),
     ),
     
     "rag_architect": AgentDefinition(
@@ -105,7 +107,7 @@ When designing RAG systems:
 
 Provide complete pipeline designs with code.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "Glob", "WebSearch"],
+        tools=("Read", "Write", "Bash", "Glob", "WebSearch"),
     ),
     
     "agent_architect": AgentDefinition(
@@ -133,7 +135,7 @@ When designing agent systems:
 
 Reference frameworks: Claude Agent SDK, LangGraph, CrewAI, AutoGen.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "Glob", "WebSearch"],
+        tools=("Read", "Write", "Bash", "Glob", "WebSearch"),
     ),
     
     "eval_architect": AgentDefinition(
@@ -161,7 +163,7 @@ When designing evaluation systems:
 
 Reference tools: promptfoo, Braintrust, LangSmith, custom solutions.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "Glob"],
+        tools=("Read", "Write", "Bash", "Glob"),
     ),
     
     "infrastructure_analyzer": AgentDefinition(
@@ -188,9 +190,9 @@ When analyzing infrastructure:
 
 Provide specific, actionable recommendations with code examples.""",
         model="claude-sonnet-4-20250514",
-        tools=["Read", "Write", "Bash", "Glob", "Grep"],
+        tools=("Read", "Write", "Bash", "Glob", "Grep"),
     ),
-}
+})
 
 def get_infrastructure_agent(name: str) -> AgentDefinition | None:
     return INFRASTRUCTURE_AGENTS.get(name)
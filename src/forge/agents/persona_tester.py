@@ -1,4 +1,6 @@
 """Persona Testing Agent for AI System Stress Testing"""
+from types import MappingProxyType
+
 from forge.agents.base import AgentDefinition
 
 PERSONA_TESTER = AgentDefinition(
@@ -119,8 +121,8 @@ When given a task:
 4. Include edge cases and failure modes
 5. Output in requested format (markdown or JSONL)""",
     model="claude-sonnet-4",
-    tools=["Read", "Write", "Bash", "Glob", "Grep"],
-    capabilities=[
+    tools=("Read", "Write", "Bash", "Glob", "Grep"),
+    capabilities=(
         "persona_generation",
         "test_case_generation", 
         "intent_testing",
@@ -128,14 +130,14 @@ When given a task:
         "edge_case_discovery",
         "hallucination_detection",
         "regression_testing"
-    ],
-    focus_areas=[
+    ),
+    focus_areas=(
         "custom_gpt_testing",
         "chatbot_qa",
         "intent_classification",
         "routing_logic",
         "response_quality"
-    ],
+    ),
 )
 
 # Companion agent for research extraction
@@ -215,19 +217,19 @@ For each source, identify and extract:
 
 {{ context | default('') }}""",
     model="claude-sonnet-4",
-    tools=["Read", "Glob", "Grep", "WebSearch"],
-    capabilities=[
+    tools=("Read", "Glob", "Grep", "WebSearch"),
+    capabilities=(
         "qualitative_analysis",
         "quote_extraction",
         "pain_point_identification",
         "user_research"
-    ],
+    ),
 )
 
-PERSONA_TESTING_AGENTS = {
+PERSONA_TESTING_AGENTS = MappingProxyType({
     "persona_tester": PERSONA_TESTER,
     "research_extractor": RESEARCH_EXTRACTOR,
-}
+})
 
 def get_persona_testing_agent(name: str) -> AgentDefinition | None:
     return PERSONA_TESTING_AGENTS.get(name)
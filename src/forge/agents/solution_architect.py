@@ -19,18 +19,20 @@ Usage:
 
 import asyncio
 import logging
-from dataclasses import dataclass, field
+import re
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from forge.agents.base import AgentDefinition, AgentResult, Task
-from forge.agents.claude_agent import ClaudeAgent
-# Import ALL_AGENTS lazily to avoid circular import
-def _get_all_agents():
-    from forge.agents import ALL_AGENTS
-    return ALL_AGENTS
-from forge.config.settings import ForgeSettings
+from forge.agents import get_agent as get_agent_definition
+from forge.agents.claude_agent import ClaudeAgent, shared_agent
+from forge.config.settings import ForgeSettings, get_settings
 from forge.schemas.workflow import (
     WorkflowDefinition,
     WorkflowStep,
@@ -44,6 +46,8 @@ from forge.schemas.change_plan import ChangePlan, Change, ChangeType, ChangeStat
 from forge.schemas.eval_result import EvalResult, EvalStatus, EvalMetric
 from forge.schemas.message import AgentMessage, MessageType, MessagePriority
 from forge.utils.cost_tracker import CostTracker
+from forge.tools.git import GitTool
+from forge.utils.execution_cache import ExecutionCache, execution_key
 
 logger = logging.getLogger(__name__)
 
@@ -136,18 +140,195 @@ When designing workflows, output:
 
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Grep", "Glob", "Bash"],
-    capabilities=[
+    tools=("Read", "Write", "Grep", "Glob", "Bash"),
+    capabilities=(
         "orchestration",
         "workflow_design",
         "goal_decomposition",
         "agent_coordination",
         "result_synthesis",
-    ],
+    ),
 )
 
 
-@dataclass
+# Goal keywords (matched as substrings) that signal each kind of work
+_GOAL_KEYWORDS = {
+    "analysis": ("analyze", "review", "check", "audit", "assess", "evaluate"),
+    "security": ("security", "vulnerab", "safe", "secure", "owasp"),
+    "api": ("api", "endpoint", "rest", "graphql", "swagger", "openapi"),
+    "database": ("database", "schema", "sql", "migration", "query"),
+    "frontend": ("frontend", "ui", "component", "react", "css", "accessibility"),
+    "fix": ("fix", "debug", "repair", "bug", "error", "issue"),
+    "improve": ("improve", "refactor", "optimize", "clean", "enhance"),
+    "test": ("test", "coverage", "verify", "validate"),
+    "docs": ("document", "readme", "comment", "docstring"),
+    "ai": ("rag", "embedding", "vector", "llm", "agent", "prompt", "ai"),
+}
+_KEYWORD_NEEDS = {kw: need for need, kws in _GOAL_KEYWORDS.items() for kw in kws}
+# One pass over the goal; the zero-width lookahead also reports overlapping
+# keywords ("repair" contains "ai"). No keyword is a prefix of another
+# need's keyword, so the first alternative at each position is enough.
+_GOAL_KEYWORDS_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_NEEDS)) + "))")
+
+
+@lru_cache(maxsize=256)
+def _plan_steps(goal: str) -> tuple[WorkflowStep, ...]:
+    """Pick the workflow steps for a goal; pure in the goal, so memoized."""
+    goal_lower = goal.lower()
+    steps = []
+    
+    # Analyze goal keywords to determine workflow pattern
+    needs = {_KEYWORD_NEEDS[m.group(1)] for m in _GOAL_KEYWORDS_RE.finditer(goal_lower)}
+    needs_analysis = "analysis" in needs
+    needs_security = "security" in needs
+    needs_api = "api" in needs
+    needs_database = "database" in needs
+    needs_frontend = "frontend" in needs
+    needs_fix = "fix" in needs
+    needs_improve = "improve" in needs
+    needs_test = "test" in needs
+    needs_docs = "docs" in needs
+    needs_ai = "ai" in needs
+    
+    step_id = 0
+    
+    # Phase 1: Analysis (parallel where possible)
+    analysis_steps = []
+    
+    if needs_analysis or not any([needs_fix, needs_improve, needs_test, needs_docs]):
+        step_id += 1
+        analysis_steps.append(WorkflowStep(
+            id=f"analyze_backend_{step_id}",
+            agent="backend_analyzer",
+            task=f"Analyze the codebase for: {goal}",
+            parallel_group="analysis",
+        ))
+    
+    if needs_security:
+        step_id += 1
+        analysis_steps.append(WorkflowStep(
+            id=f"analyze_security_{step_id}",
+            agent="security_analyzer",
+            task=f"Security analysis for: {goal}",
+            parallel_group="analysis",
+        ))
+    
+    if needs_api:
+        step_id += 1
+        analysis_steps.append(WorkflowStep(
+            id=f"analyze_api_{step_id}",
+            agent="api_architect",
+            task=f"API design/review for: {goal}",
+            parallel_group="analysis",
+        ))
+    
+    if needs_database:
+        step_id += 1
+        analysis_steps.append(WorkflowStep(
+            id=f"analyze_database_{step_id}",
+            agent="database_architect",
+            task=f"Database analysis for: {goal}",
+            parallel_group="analysis",
+        ))
+    
+    if needs_frontend:
+        step_id += 1
+        analysis_steps.append(WorkflowStep(
+            id=f"analyze_frontend_{step_id}",
+            agent="frontend_analyzer",
+            task=f"Frontend analysis for: {goal}",
+            parallel_group="analysis",
+        ))
+    
+    if needs_ai:
+        step_id += 1
+        analysis_steps.append(WorkflowStep(
+            id=f"analyze_ai_{step_id}",
+            agent="rag_architect",
+            task=f"AI/RAG analysis for: {goal}",
+            parallel_group="analysis",
+        ))
+    
+    steps.extend(analysis_steps)
+    analysis_step_ids = [s.id for s in analysis_steps]
+    
+    # Phase 2: Action (depends on analysis)
+    action_step_ids = []
+    if needs_fix:
+        step_id += 1
+        action_step_ids.append(f"fix_{step_id}")
+        steps.append(WorkflowStep(
+            id=action_step_ids[-1],
+            agent="debugger",
+            task=f"Fix issues identified: {goal}",
+            depends_on=analysis_step_ids,
+            inputs={"findings": "$analysis.findings"},
+        ))
+    
+    if needs_improve:
+        step_id += 1
+        action_step_ids.append(f"improve_{step_id}")
+        steps.append(WorkflowStep(
+            id=action_step_ids[-1],
+            agent="improver",
+            task=f"Improve code: {goal}",
+            depends_on=analysis_step_ids,
+            inputs={"findings": "$analysis.findings"},
+        ))
+    
+    # Phase 3: Verification
+    if needs_test or needs_fix or needs_improve:
+        step_id += 1
+        steps.append(WorkflowStep(
+            id=f"test_{step_id}",
+            agent="tester",
+            task=f"Create and run tests for: {goal}",
+            depends_on=action_step_ids if action_step_ids else analysis_step_ids,
+        ))
+    
+    # Phase 4: Documentation
+    if needs_docs:
+        step_id += 1
+        steps.append(WorkflowStep(
+            id=f"document_{step_id}",
+            agent="documenter",
+            task=f"Update documentation for: {goal}",
+            depends_on=[s.id for s in steps],
+        ))
+    
+    # Default workflow if no specific pattern matched
+    if not steps:
+        steps = [
+            WorkflowStep(
+                id="analyze_1",
+                agent="backend_analyzer",
+                task=f"Analyze the codebase for: {goal}",
+            ),
+            WorkflowStep(
+                id="improve_2",
+                agent="improver",
+                task=f"Implement improvements: {goal}",
+                depends_on=["analyze_1"],
+            ),
+        ]
+    
+    return tuple(steps)
+
+
+# A step's findings, change plans and eval results as schema objects
+_StepOutputs = tuple[list[Finding], list[ChangePlan], list[EvalResult]]
+
+
+def _convert_step_outputs(step: WorkflowStep) -> _StepOutputs:
+    """Convert the result dicts a step produced into schema objects."""
+    return (
+        [Finding.from_dict(f) for f in step.findings or ()],
+        [ChangePlan.from_dict(step.change_plan)] if step.change_plan else [],
+        [EvalResult.from_dict(step.eval_result)] if step.eval_result else [],
+    )
+
+
+@dataclass(slots=True)
 class WorkflowExecutionResult:
     """Result of executing a complete workflow."""
     workflow: WorkflowDefinition
@@ -175,27 +356,29 @@ class SolutionArchitect:
         settings: ForgeSettings | None = None,
         working_dir: Path | None = None,
     ):
-        self.settings = settings or ForgeSettings()
+        self.settings = settings or get_settings()
         self.working_dir = working_dir or self.settings.project_dir
         self.cost_tracker = CostTracker(budget_usd=self.settings.budget_usd)
         self.logger = logging.getLogger("forge.solution_architect")
         self._agents: dict[str, ClaudeAgent] = {}
-        self._message_queue: list[AgentMessage] = []
+        self._message_queue: deque[AgentMessage] = deque(maxlen=self.settings.message_queue_max)
+        # Step costs awaiting a batched cost_tracker.record_batch()
+        self._pending_costs: list[dict[str, Any]] = []
+        self._execution_cache: ExecutionCache | None = None
+        if self.settings.execution_cache_ttl_seconds > 0:
+            self._execution_cache = ExecutionCache(
+                self.settings.execution_cache_path,
+                self.settings.execution_cache_ttl_seconds,
+            )
         
     def _get_agent(self, name: str) -> ClaudeAgent | None:
         """Get or create an agent by name."""
-        all_agents = _get_all_agents()
-        if name not in all_agents:
-            self.logger.warning(f"Agent not found: {name}")
-            return None
-        
         if name not in self._agents:
-            definition = all_agents[name]
-            self._agents[name] = ClaudeAgent(
-                definition=definition,
-                settings=self.settings,
-                working_dir=self.working_dir,
-            )
+            definition = get_agent_definition(name)
+            if definition is None:
+                self.logger.warning(f"Agent not found: {name}")
+                return None
+            self._agents[name] = shared_agent(definition, self.settings, self.working_dir)
         
         return self._agents[name]
     
@@ -208,160 +391,18 @@ class SolutionArchitect:
         """
         self.logger.info(f"Designing workflow for goal: {goal}")
         
-        goal_lower = goal.lower()
-        steps = []
-        
-        # Analyze goal keywords to determine workflow pattern
-        needs_analysis = any(w in goal_lower for w in [
-            "analyze", "review", "check", "audit", "assess", "evaluate"
-        ])
-        needs_security = any(w in goal_lower for w in [
-            "security", "vulnerab", "safe", "secure", "owasp"
-        ])
-        needs_api = any(w in goal_lower for w in [
-            "api", "endpoint", "rest", "graphql", "swagger", "openapi"
-        ])
-        needs_database = any(w in goal_lower for w in [
-            "database", "schema", "sql", "migration", "query"
-        ])
-        needs_frontend = any(w in goal_lower for w in [
-            "frontend", "ui", "component", "react", "css", "accessibility"
-        ])
-        needs_fix = any(w in goal_lower for w in [
-            "fix", "debug", "repair", "bug", "error", "issue"
-        ])
-        needs_improve = any(w in goal_lower for w in [
-            "improve", "refactor", "optimize", "clean", "enhance"
-        ])
-        needs_test = any(w in goal_lower for w in [
-            "test", "coverage", "verify", "validate"
-        ])
-        needs_docs = any(w in goal_lower for w in [
-            "document", "readme", "comment", "docstring"
-        ])
-        needs_ai = any(w in goal_lower for w in [
-            "rag", "embedding", "vector", "llm", "agent", "prompt", "ai"
-        ])
-        
-        step_id = 0
-        
-        # Phase 1: Analysis (parallel where possible)
-        analysis_steps = []
-        
-        if needs_analysis or not any([needs_fix, needs_improve, needs_test, needs_docs]):
-            step_id += 1
-            analysis_steps.append(WorkflowStep(
-                id=f"analyze_backend_{step_id}",
-                agent="backend_analyzer",
-                task=f"Analyze the codebase for: {goal}",
-                parallel_group="analysis",
-            ))
-        
-        if needs_security:
-            step_id += 1
-            analysis_steps.append(WorkflowStep(
-                id=f"analyze_security_{step_id}",
-                agent="security_analyzer",
-                task=f"Security analysis for: {goal}",
-                parallel_group="analysis",
-            ))
-        
-        if needs_api:
-            step_id += 1
-            analysis_steps.append(WorkflowStep(
-                id=f"analyze_api_{step_id}",
-                agent="api_architect",
-                task=f"API design/review for: {goal}",
-                parallel_group="analysis",
-            ))
-        
-        if needs_database:
-            step_id += 1
-            analysis_steps.append(WorkflowStep(
-                id=f"analyze_database_{step_id}",
-                agent="database_architect",
-                task=f"Database analysis for: {goal}",
-                parallel_group="analysis",
-            ))
-        
-        if needs_frontend:
-            step_id += 1
-            analysis_steps.append(WorkflowStep(
-                id=f"analyze_frontend_{step_id}",
-                agent="frontend_analyzer",
-                task=f"Frontend analysis for: {goal}",
-                parallel_group="analysis",
-            ))
-        
-        if needs_ai:
-            step_id += 1
-            analysis_steps.append(WorkflowStep(
-                id=f"analyze_ai_{step_id}",
-                agent="rag_architect",
-                task=f"AI/RAG analysis for: {goal}",
-                parallel_group="analysis",
-            ))
-        
-        steps.extend(analysis_steps)
-        analysis_step_ids = [s.id for s in analysis_steps]
-        
-        # Phase 2: Action (depends on analysis)
-        if needs_fix:
-            step_id += 1
-            steps.append(WorkflowStep(
-                id=f"fix_{step_id}",
-                agent="debugger",
-                task=f"Fix issues identified: {goal}",
-                depends_on=analysis_step_ids,
-                inputs={"findings": "$analysis.findings"},
-            ))
-        
-        if needs_improve:
-            step_id += 1
-            steps.append(WorkflowStep(
-                id=f"improve_{step_id}",
-                agent="improver",
-                task=f"Improve code: {goal}",
-                depends_on=analysis_step_ids,
-                inputs={"findings": "$analysis.findings"},
-            ))
-        
-        # Phase 3: Verification
-        if needs_test or needs_fix or needs_improve:
-            step_id += 1
-            action_step_ids = [s.id for s in steps if s.id.startswith(("fix_", "improve_"))]
-            steps.append(WorkflowStep(
-                id=f"test_{step_id}",
-                agent="tester",
-                task=f"Create and run tests for: {goal}",
-                depends_on=action_step_ids if action_step_ids else analysis_step_ids,
-            ))
-        
-        # Phase 4: Documentation
-        if needs_docs:
-            step_id += 1
-            steps.append(WorkflowStep(
-                id=f"document_{step_id}",
-                agent="documenter",
-                task=f"Update documentation for: {goal}",
-                depends_on=[s.id for s in steps],
-            ))
-        
-        # Default workflow if no specific pattern matched
-        if not steps:
-            steps = [
-                WorkflowStep(
-                    id="analyze_1",
-                    agent="backend_analyzer",
-                    task=f"Analyze the codebase for: {goal}",
-                ),
-                WorkflowStep(
-                    id="improve_2",
-                    agent="improver",
-                    task=f"Implement improvements: {goal}",
-                    depends_on=["analyze_1"],
-                ),
-            ]
+        # Copy the cached plan, including its mutable fields; workflows
+        # mutate their steps while running
+        steps = [
+            replace(
+                t,
+                depends_on=list(t.depends_on),
+                inputs=dict(t.inputs),
+                outputs=dict(t.outputs),
+                findings=list(t.findings),
+            )
+            for t in _plan_steps(goal)
+        ]
         
         workflow = WorkflowDefinition(
             name=f"Workflow: {goal[:50]}...",
@@ -384,102 +425,102 @@ class SolutionArchitect:
         and handling errors appropriately.
         """
         self.logger.info(f"Executing workflow: {workflow.name}")
-        start_time = datetime.utcnow()
+        start_perf = time.perf_counter()
         
         workflow.status = WorkflowStatus.RUNNING
-        workflow.started_at = start_time
+        workflow.started_at = datetime.utcnow()
         
         result = WorkflowExecutionResult(workflow=workflow, success=True)
         
+        # Every ready step starts as soon as its dependencies complete; the
+        # semaphore caps how many agents run at once.
+        slots = asyncio.Semaphore(workflow.max_parallel_steps)
+        in_flight: dict[asyncio.Task, WorkflowStep] = {}
+        
+        # Unmet-dependency counts plus reverse edges, built once, so a
+        # completion only touches its own dependents instead of rescanning
+        # every step. Unknown dependency ids are ignored, as in get_ready_steps.
+        steps_by_id: dict[str, WorkflowStep] = {}
+        for step in workflow.steps:
+            steps_by_id.setdefault(step.id, step)
+        unmet: dict[str, int] = {}
+        dependents: dict[str, list[WorkflowStep]] = defaultdict(list)
+        ready: deque[WorkflowStep] = deque()
+        for step in workflow.steps:
+            if step.status != StepStatus.PENDING:
+                continue
+            deps = [
+                dep_id for dep_id in step.depends_on
+                if dep_id in steps_by_id and steps_by_id[dep_id].status != StepStatus.COMPLETED
+            ]
+            unmet[step.id] = len(deps)
+            for dep_id in deps:
+                dependents[dep_id].append(step)
+            if not deps:
+                ready.append(step)
+        
+        async def run_step(step: WorkflowStep) -> AgentResult:
+            async with slots:
+                return await self._execute_step(step, workflow)
+        
+        # Step outputs converted as each step finishes, so the conversion
+        # overlaps with agents still running; keyed by step id
+        converted: dict[str, _StepOutputs] = {}
+        
         try:
             while True:
-                # Get steps that are ready to execute
-                ready_steps = workflow.get_ready_steps()
+                # Stop starting new steps once the workflow has failed
+                if result.success:
+                    while ready:
+                        step = ready.popleft()
+                        in_flight[asyncio.ensure_future(run_step(step))] = step
+                
+                if not in_flight:
+                    break
                 
-                if not ready_steps:
-                    # Check if we're done or stuck
-                    pending = [s for s in workflow.steps if s.status == StepStatus.PENDING]
-                    if not pending:
-                        break  # All done
-                    
-                    # Check for circular dependencies or failed deps
-                    running = [s for s in workflow.steps if s.status == StepStatus.RUNNING]
-                    if not running:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = in_flight.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        converted.setdefault(step.id, _convert_step_outputs(step))
+                        if step.status == StepStatus.COMPLETED:
+                            for child in dependents.get(step.id, ()):
+                                unmet[child.id] -= 1
+                                if unmet[child.id] == 0:
+                                    ready.append(child)
+                        continue
+                    step.status = StepStatus.FAILED
+                    step.error_message = str(error)
+                    if workflow.stop_on_failure and result.success:
                         workflow.status = WorkflowStatus.FAILED
-                        workflow.error_message = "Workflow stuck: steps have unmet dependencies"
+                        workflow.failed_step_id = step.id
                         result.success = False
-                        result.error = workflow.error_message
-                        break
-                    
-                    # Wait for running steps
-                    await asyncio.sleep(0.1)
-                    continue
+                        result.error = f"Step {step.id} failed: {error}"
                 
-                # Group steps by parallel_group
-                parallel_groups: dict[str, list[WorkflowStep]] = {}
-                sequential_steps: list[WorkflowStep] = []
-                
-                for step in ready_steps:
-                    if step.parallel_group:
-                        if step.parallel_group not in parallel_groups:
-                            parallel_groups[step.parallel_group] = []
-                        parallel_groups[step.parallel_group].append(step)
-                    else:
-                        sequential_steps.append(step)
-                
-                # Execute parallel groups
-                for group_name, group_steps in parallel_groups.items():
-                    self.logger.info(f"Executing parallel group: {group_name}")
-                    tasks = [self._execute_step(step, workflow) for step in group_steps]
-                    step_results = await asyncio.gather(*tasks, return_exceptions=True)
-                    
-                    for step, step_result in zip(group_steps, step_results):
-                        if isinstance(step_result, Exception):
-                            step.status = StepStatus.FAILED
-                            step.error_message = str(step_result)
-                            if workflow.stop_on_failure:
-                                workflow.status = WorkflowStatus.FAILED
-                                workflow.failed_step_id = step.id
-                                result.success = False
-                                result.error = f"Step {step.id} failed: {step_result}"
-                                break
-                
-                # Execute sequential steps one at a time
-                for step in sequential_steps[:workflow.max_parallel_steps]:
-                    if not result.success and workflow.stop_on_failure:
-                        break
-                    
-                    try:
-                        await self._execute_step(step, workflow)
-                    except Exception as e:
-                        step.status = StepStatus.FAILED
-                        step.error_message = str(e)
-                        if workflow.stop_on_failure:
-                            workflow.status = WorkflowStatus.FAILED
-                            workflow.failed_step_id = step.id
-                            result.success = False
-                            result.error = f"Step {step.id} failed: {e}"
-                            break
-                
-                # Check budget
-                if self.cost_tracker.is_over_budget():
+                # Record this wake-up's step costs together, then check budget
+                if self._flush_costs() and result.success and self.cost_tracker.is_over_budget():
                     workflow.status = WorkflowStatus.FAILED
                     workflow.error_message = "Budget exceeded"
                     result.success = False
                     result.error = "Budget exceeded"
-                    break
-                
-                if not result.success:
-                    break
             
-            # Aggregate results
-            for step in workflow.steps:
-                if step.findings:
-                    result.findings.extend([Finding.from_dict(f) for f in step.findings])
-                if step.change_plan:
-                    result.change_plans.append(ChangePlan.from_dict(step.change_plan))
-                if step.eval_result:
-                    result.eval_results.append(EvalResult.from_dict(step.eval_result))
+            # Check for circular dependencies or failed deps
+            if result.success and any(s.status == StepStatus.PENDING for s in workflow.steps):
+                workflow.status = WorkflowStatus.FAILED
+                workflow.error_message = "Workflow stuck: steps have unmet dependencies"
+                result.success = False
+                result.error = workflow.error_message
+            
+            # Aggregate results in step order; only steps that didn't run
+            # here still need converting
+            outputs = [
+                converted.pop(step.id, None) or _convert_step_outputs(step)
+                for step in workflow.steps
+            ]
+            result.findings = list(chain.from_iterable(o[0] for o in outputs))
+            result.change_plans = list(chain.from_iterable(o[1] for o in outputs))
+            result.eval_results = list(chain.from_iterable(o[2] for o in outputs))
             
             if result.success:
                 workflow.status = WorkflowStatus.COMPLETED
@@ -492,9 +533,12 @@ class SolutionArchitect:
             result.error = str(e)
         
         finally:
-            end_time = datetime.utcnow()
-            workflow.completed_at = end_time
-            result.duration_seconds = (end_time - start_time).total_seconds()
+            # Only non-empty if we're unwinding from an error or cancellation
+            for task in in_flight:
+                task.cancel()
+            self._flush_costs()
+            workflow.completed_at = datetime.utcnow()
+            result.duration_seconds = time.perf_counter() - start_perf
             result.total_cost_usd = self.cost_tracker.total_cost_usd
             result.total_tokens = self.cost_tracker.total_tokens
         
@@ -510,6 +554,7 @@ class SolutionArchitect:
         
         step.status = StepStatus.RUNNING
         step.started_at = datetime.utcnow()
+        start_perf = time.perf_counter()
         workflow.current_step_id = step.id
         
         agent = self._get_agent(step.agent)
@@ -517,9 +562,7 @@ class SolutionArchitect:
             raise ValueError(f"Agent not found: {step.agent}")
         
         # Resolve input references
-        resolved_inputs = {}
-        for key, value in step.inputs.items():
-            resolved_inputs[key] = workflow.resolve_input(value)
+        resolved_inputs = step.resolve_inputs(workflow)
         
         # Create task
         task = Task(
@@ -547,7 +590,7 @@ class SolutionArchitect:
         
         # Update step with results
         step.completed_at = datetime.utcnow()
-        step.duration_seconds = (step.completed_at - step.started_at).total_seconds()
+        step.duration_seconds = time.perf_counter() - start_perf
         step.result = result.output
         
         if result.success:
@@ -556,15 +599,24 @@ class SolutionArchitect:
             step.status = StepStatus.FAILED
             step.error_message = result.error
         
-        # Track costs
-        self.cost_tracker.record(
-            model=agent.definition.model,
-            input_tokens=result.tokens_used // 2,
-            output_tokens=result.tokens_used // 2,
-        )
+        # Track costs; recorded in batches by execute_workflow
+        input_tokens, output_tokens = result.token_split()
+        self._pending_costs.append({
+            "model": agent.definition.model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        })
         
         return result
     
+    def _flush_costs(self) -> bool:
+        """Record buffered step costs; return whether there were any."""
+        if not self._pending_costs:
+            return False
+        self.cost_tracker.record_batch(self._pending_costs)
+        self._pending_costs.clear()
+        return True
+    
     async def execute_goal(
         self,
         goal: str,
@@ -574,17 +626,46 @@ class SolutionArchitect:
         High-level entry point: design and execute a workflow for a goal.
         
         This is the primary method for using the Solution Architect.
+        
+        With the execution cache on, workflows whose agents don't write files
+        are served from it while the repository (HEAD and any uncommitted
+        changes) is in the same state.
         """
         self.logger.info(f"Executing goal: {goal}")
+        start = time.perf_counter()
         
         # Design the workflow
         workflow = self.design_workflow(goal, context)
         
+        cache = self._execution_cache
+        key = None
+        if cache is not None and not self._edits_files(workflow):
+            repo_state = await asyncio.to_thread(GitTool(self.working_dir).state_fingerprint)
+            if repo_state is not None:
+                key = execution_key(goal, context, self.working_dir, self.settings.fingerprint(), repo_state)
+                cached = cache.get(key)
+                if cached is not None:
+                    self.logger.info("Serving goal from execution cache")
+                    cached.duration_seconds = time.perf_counter() - start
+                    return cached
+        
         # Execute the workflow
         result = await self.execute_workflow(workflow)
         
+        if key is not None and result.success:
+            cache.put(key, result, tokens_saved=result.total_tokens)
+        
         return result
     
+    @staticmethod
+    def _edits_files(workflow: WorkflowDefinition) -> bool:
+        """Whether any step of the workflow may write files (or is unknown)."""
+        for step in workflow.steps:
+            definition = get_agent_definition(step.agent)
+            if definition is None or definition.edits_files:
+                return True
+        return False
+    
     def get_cost_summary(self) -> dict[str, Any]:
         """Get cost tracking summary."""
         return self.cost_tracker.get_summary()
@@ -593,13 +674,17 @@ class SolutionArchitect:
         """Clean up resources."""
         self._agents.clear()
         self._message_queue.clear()
+        if self._execution_cache is not None:
+            self._execution_cache.close()
         self.logger.info("Solution Architect cleanup complete")
 
 
-# Predefined workflow templates
+# Predefined workflow templates. Each call builds a fresh definition, so
+# running one never mutates the steps another caller sees.
+
 
-WORKFLOW_TEMPLATES = {
-    "full_stack_feature": WorkflowDefinition(
+def _build_full_stack_feature() -> WorkflowDefinition:
+    return WorkflowDefinition(
         name="Full Stack Feature Development",
         description="End-to-end workflow for implementing a new feature",
         steps=[
@@ -645,9 +730,11 @@ WORKFLOW_TEMPLATES = {
                 depends_on=["test", "security"],
             ),
         ],
-    ),
-    
-    "security_audit": WorkflowDefinition(
+    )
+
+
+def _build_security_audit() -> WorkflowDefinition:
+    return WorkflowDefinition(
         name="Security Audit",
         description="Comprehensive security review of the codebase",
         steps=[
@@ -681,9 +768,11 @@ WORKFLOW_TEMPLATES = {
                 depends_on=["fix"],
             ),
         ],
-    ),
-    
-    "code_quality": WorkflowDefinition(
+    )
+
+
+def _build_code_quality() -> WorkflowDefinition:
+    return WorkflowDefinition(
         name="Code Quality Improvement",
         description="Improve overall code quality and maintainability",
         steps=[
@@ -718,9 +807,11 @@ WORKFLOW_TEMPLATES = {
                 depends_on=["test"],
             ),
         ],
-    ),
-    
-    "rag_implementation": WorkflowDefinition(
+    )
+
+
+def _build_rag_implementation() -> WorkflowDefinition:
+    return WorkflowDefinition(
         name="RAG Pipeline Implementation",
         description="Design and implement a RAG pipeline",
         steps=[
@@ -754,13 +845,21 @@ WORKFLOW_TEMPLATES = {
                 depends_on=["design_rag"],
             ),
         ],
-    ),
+    )
+
+
+WORKFLOW_TEMPLATES: dict[str, Callable[[], WorkflowDefinition]] = {
+    "full_stack_feature": _build_full_stack_feature,
+    "security_audit": _build_security_audit,
+    "code_quality": _build_code_quality,
+    "rag_implementation": _build_rag_implementation,
 }
 
 
 def get_workflow_template(name: str) -> WorkflowDefinition | None:
-    """Get a predefined workflow template by name."""
-    return WORKFLOW_TEMPLATES.get(name)
+    """Get a fresh copy of a predefined workflow template by name."""
+    builder = WORKFLOW_TEMPLATES.get(name)
+    return builder() if builder else None
 
 
 def list_workflow_templates() -> list[str]:
@@ -1,4 +1,6 @@
 """Specialist Agents for code analysis"""
+from types import MappingProxyType
+
 from forge.agents.base import AgentDefinition
 
 BACKEND_ANALYZER = AgentDefinition(
@@ -11,8 +13,8 @@ BACKEND_ANALYZER = AgentDefinition(
 4. Code quality and best practices
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Grep", "Glob", "Bash"],
-    capabilities=["bug_detection", "performance_analysis", "code_review"],
+    tools=("Read", "Grep", "Glob", "Bash"),
+    capabilities=("bug_detection", "performance_analysis", "code_review"),
 )
 
 FRONTEND_ANALYZER = AgentDefinition(
@@ -25,8 +27,8 @@ FRONTEND_ANALYZER = AgentDefinition(
 4. Best practices (React, Vue, etc.)
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Grep", "Glob", "Bash"],
-    capabilities=["ui_analysis", "accessibility", "performance"],
+    tools=("Read", "Grep", "Glob", "Bash"),
+    capabilities=("ui_analysis", "accessibility", "performance"),
 )
 
 SECURITY_ANALYZER = AgentDefinition(
@@ -40,8 +42,8 @@ SECURITY_ANALYZER = AgentDefinition(
 5. Dependency vulnerabilities
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Grep", "Glob", "Bash"],
-    capabilities=["security_audit", "vulnerability_detection"],
+    tools=("Read", "Grep", "Glob", "Bash"),
+    capabilities=("security_audit", "vulnerability_detection"),
 )
 
 DATABASE_ARCHITECT = AgentDefinition(
@@ -54,8 +56,8 @@ DATABASE_ARCHITECT = AgentDefinition(
 4. Migration planning
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Bash"],
-    capabilities=["schema_design", "query_optimization"],
+    tools=("Read", "Write", "Bash"),
+    capabilities=("schema_design", "query_optimization"),
 )
 
 VECTOR_SEARCH_ARCHITECT = AgentDefinition(
@@ -68,8 +70,8 @@ VECTOR_SEARCH_ARCHITECT = AgentDefinition(
 4. Vector database selection
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Bash"],
-    capabilities=["embeddings", "semantic_search"],
+    tools=("Read", "Write", "Bash"),
+    capabilities=("embeddings", "semantic_search"),
 )
 
 LANGCHAIN_ARCHITECT = AgentDefinition(
@@ -82,8 +84,8 @@ LANGCHAIN_ARCHITECT = AgentDefinition(
 4. Memory strategies
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write", "Bash"],
-    capabilities=["langchain", "agent_design"],
+    tools=("Read", "Write", "Bash"),
+    capabilities=("langchain", "agent_design"),
 )
 
 PROMPT_ENGINEER = AgentDefinition(
@@ -96,11 +98,12 @@ PROMPT_ENGINEER = AgentDefinition(
 4. Model-specific tuning
 {{ context | default('') }}""",
     model="claude-sonnet-4-20250514",
-    tools=["Read", "Write"],
-    capabilities=["prompt_design", "optimization"],
+    tools=("Read", "Write"),
+    capabilities=("prompt_design", "optimization"),
 )
 
-SPECIALIST_AGENTS = {
+# Specialist Agents (read-only view)
+SPECIALIST_AGENTS = MappingProxyType({
     "backend_analyzer": BACKEND_ANALYZER,
     "frontend_analyzer": FRONTEND_ANALYZER,
     "security_analyzer": SECURITY_ANALYZER,
@@ -108,10 +111,11 @@ SPECIALIST_AGENTS = {
     "vector_search_architect": VECTOR_SEARCH_ARCHITECT,
     "langchain_architect": LANGCHAIN_ARCHITECT,
     "prompt_engineer": PROMPT_ENGINEER,
-}
+})
+_SPECIALIST_NAMES = tuple(SPECIALIST_AGENTS)
 
 def get_specialist(name: str) -> AgentDefinition | None:
     return SPECIALIST_AGENTS.get(name)
 
 def list_specialists() -> list[str]:
-    return list(SPECIALIST_AGENTS.keys())
+    return list(_SPECIALIST_NAMES)
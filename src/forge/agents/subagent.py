@@ -1,18 +1,25 @@
 """Subagent spawning and orchestration"""
 import asyncio
+import hashlib
+import json
 import logging
-import uuid
-from dataclasses import dataclass, field
-from typing import Any, Callable
+import itertools
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Awaitable, Callable, Sequence
 from pathlib import Path
 
 from forge.agents.base import AgentDefinition, AgentResult, Task
-from forge.agents.claude_agent import ClaudeAgent
+from forge.agents.claude_agent import shared_agent
 from forge.config.settings import ForgeSettings
+from forge.utils import fastjson
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class SubagentTask:
     """A task to be executed by a subagent."""
     id: str
@@ -21,7 +28,7 @@ class SubagentTask:
     context: dict[str, Any] = field(default_factory=dict)
     parent_task_id: str | None = None
 
-@dataclass
+@dataclass(slots=True)
 class SubagentResult:
     """Result from a subagent execution."""
     task_id: str
@@ -31,22 +38,209 @@ class SubagentResult:
     cost_usd: float = 0.0
     tokens_used: int = 0
 
+Embedder = Callable[[str], Awaitable[Sequence[float]]]
+
+# Context keys whose values change from run to run; tasks carrying them
+# are never served from or written to the semantic cache. Neither cache is
+# used for agents that can edit files or run commands, since a cached
+# result wouldn't have made the changes.
+_VOLATILE_CONTEXT_KEYS = frozenset({"timestamp", "now", "nonce", "request_id", "session_id", "run_id"})
+
+
+def openai_embedder(settings: ForgeSettings) -> Embedder:
+    """Embed text with the configured OpenAI embedding model."""
+    import openai
+    client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+    model = settings.memory.embedding_model
+    
+    async def embed(text: str) -> Sequence[float]:
+        response = await client.embeddings.create(model=model, input=text)
+        return response.data[0].embedding
+    
+    return embed
+
+
+class _CacheRows:
+    """Normalized embeddings and results for one (agent, context) pair."""
+    
+    def __init__(self, np: Any, dim: int):
+        self._np = np
+        self.matrix = np.empty((8, dim), dtype=np.float32)
+        self.size = 0
+        self.results: list[SubagentResult] = []
+    
+    def append(self, vector: Any, result: SubagentResult):
+        # Double on growth so appends stay amortized O(1)
+        if self.size == len(self.matrix):
+            grown = self._np.empty((2 * self.size, self.matrix.shape[1]), dtype=self._np.float32)
+            grown[:self.size] = self.matrix
+            self.matrix = grown
+        self.matrix[self.size] = vector
+        self.size += 1
+        self.results.append(result)
+
+
+class SemanticCache:
+    """Serves subagent results for tasks close in meaning to ones already run.
+    
+    Entries are partitioned by agent name and a hash of the task context, so
+    only the description is compared by cosine similarity.
+    """
+    
+    def __init__(self, embed: Embedder, threshold: float = 0.92):
+        from forge.utils.optional import require_numpy
+        self._np = require_numpy()
+        self.embed = embed
+        self.threshold = threshold
+        self._rows: dict[tuple[str, str], _CacheRows] = {}
+    
+    @staticmethod
+    def cacheable(subtask: SubagentTask) -> bool:
+        return subtask.agent_definition.read_only and _VOLATILE_CONTEXT_KEYS.isdisjoint(subtask.context)
+    
+    @staticmethod
+    def _key(subtask: SubagentTask) -> tuple[str, str]:
+        context = json.dumps(subtask.context, sort_keys=True, default=str)
+        return subtask.agent_definition.name, hashlib.sha256(context.encode()).hexdigest()
+    
+    async def vector(self, text: str) -> Any:
+        """Embed text as an L2-normalized float32 vector."""
+        vector = self._np.asarray(await self.embed(text), dtype=self._np.float32)
+        norm = self._np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, subtask: SubagentTask, vector: Any) -> SubagentResult | None:
+        """Return the closest cached result above the threshold, if any."""
+        rows = self._rows.get(self._key(subtask))
+        if rows is None or not rows.size:
+            return None
+        scores = rows.matrix[:rows.size] @ vector
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+        return rows.results[best]
+    
+    def add(self, subtask: SubagentTask, vector: Any, result: SubagentResult):
+        key = self._key(subtask)
+        rows = self._rows.get(key)
+        if rows is None:
+            rows = self._rows[key] = _CacheRows(self._np, len(vector))
+        rows.append(vector, result)
+
+
 class SubagentOrchestrator:
     """Orchestrates multiple subagents for parallel or sequential execution."""
     
-    def __init__(self, settings: ForgeSettings, working_dir: Path):
+    def __init__(
+        self,
+        settings: ForgeSettings,
+        working_dir: Path,
+        cache: SemanticCache | None = None,
+    ):
         self.settings = settings
         self.working_dir = working_dir
         self.active_subagents: dict[str, asyncio.Task] = {}
         self.results: dict[str, SubagentResult] = {}
         self.total_cost = 0.0
         self.total_tokens = 0
+        # Results of identical earlier calls with the time they were made,
+        # shared across processes through an append-only log
+        self._exact_cache: dict[str, tuple[float, SubagentResult]] = {}
+        self._exact_cache_path = settings.memory.persist_dir / "subagent_cache.jsonl"
+        self._exact_cache_lock = threading.Lock()
+        if settings.cache_enabled:
+            self._load_exact_cache()
+            if cache is None:
+                cache = SemanticCache(openai_embedder(settings), settings.semantic_cache_threshold)
+        self.cache = cache
+    
+    def _cache_key(self, subtask: SubagentTask) -> str:
+        """Hash everything that determines what a subagent call returns."""
+        definition = subtask.agent_definition
+        parts = (
+            definition.model,
+            ",".join(sorted(definition.tools)),
+            definition.prompt_template or "",
+            str(self.working_dir),
+            subtask.description,
+            json.dumps(subtask.context, sort_keys=True, default=str),
+        )
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+    
+    def _load_exact_cache(self):
+        """Read the unexpired entries, compacting the log if any were dropped."""
+        if not self._exact_cache_path.exists():
+            return
+        cutoff = time.time() - self.settings.subagent_cache_ttl_seconds
+        lines = 0
+        try:
+            with open(self._exact_cache_path, "rb") as f:
+                for line in f:
+                    lines += 1
+                    entry = fastjson.loads(line)
+                    if entry["at"] >= cutoff:
+                        self._exact_cache[entry["key"]] = (entry["at"], SubagentResult(**entry["result"]))
+        except Exception as e:
+            logger.warning(f"Failed to load subagent cache: {e}")
+        if lines > len(self._exact_cache):
+            self._rewrite_exact_cache()
+    
+    def _rewrite_exact_cache(self):
+        """Write the live entries to a temp file and rename it into place."""
+        try:
+            tmp = self._exact_cache_path.with_suffix(".tmp")
+            tmp.write_bytes(b"".join(
+                self._exact_cache_line(key, at, result) for key, (at, result) in self._exact_cache.items()
+            ))
+            os.replace(tmp, self._exact_cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to save subagent cache: {e}")
+    
+    @staticmethod
+    def _exact_cache_line(key: str, at: float, result: SubagentResult) -> bytes:
+        return fastjson.dumps({"key": key, "at": at, "result": asdict(result)}, newline=True)
+    
+    def _append_exact_cache(self, key: str, at: float, result: SubagentResult):
+        """Append one entry to the log; run in a worker thread."""
+        try:
+            with self._exact_cache_lock:
+                self._exact_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self._exact_cache_path, "ab") as f:
+                    f.write(self._exact_cache_line(key, at, result))
+        except Exception as e:
+            logger.warning(f"Failed to save subagent cache: {e}")
+    
+    def _cached(self, subtask: SubagentTask, hit: SubagentResult) -> SubagentResult:
+        # Nothing was spent on this run
+        subagent_result = replace(hit, task_id=subtask.id, cost_usd=0.0, tokens_used=0)
+        self.results[subtask.id] = subagent_result
+        return subagent_result
     
     async def spawn(self, subtask: SubagentTask) -> SubagentResult:
         """Spawn a single subagent and wait for completion."""
         logger.info(f"Spawning subagent for task: {subtask.id}")
         
-        agent = ClaudeAgent(subtask.agent_definition, self.settings, self.working_dir)
+        exact_key = None
+        if self.settings.cache_enabled and subtask.agent_definition.read_only:
+            exact_key = self._cache_key(subtask)
+            entry = self._exact_cache.get(exact_key)
+            if entry is not None and time.time() - entry[0] < self.settings.subagent_cache_ttl_seconds:
+                logger.info(f"Exact cache hit for task: {subtask.id}")
+                return self._cached(subtask, entry[1])
+        
+        vector = None
+        if self.cache is not None and self.cache.cacheable(subtask):
+            try:
+                vector = await self.cache.vector(subtask.description)
+            except Exception as e:
+                logger.warning(f"Semantic cache unavailable for {subtask.id}: {e}")
+            else:
+                hit = self.cache.lookup(subtask, vector)
+                if hit is not None:
+                    logger.info(f"Semantic cache hit for task: {subtask.id}")
+                    return self._cached(subtask, hit)
+        
+        agent = shared_agent(subtask.agent_definition, self.settings, self.working_dir)
         task = Task(
             id=subtask.id,
             description=subtask.description,
@@ -73,6 +267,14 @@ class SubagentOrchestrator:
                 error=str(e),
             )
         
+        if subagent_result.success:
+            if exact_key is not None:
+                now = time.time()
+                self._exact_cache[exact_key] = (now, subagent_result)
+                await asyncio.to_thread(self._append_exact_cache, exact_key, now, subagent_result)
+            if vector is not None:
+                self.cache.add(subtask, vector, subagent_result)
+        
         self.results[subtask.id] = subagent_result
         self.total_cost += subagent_result.cost_usd
         self.total_tokens += subagent_result.tokens_used
@@ -84,28 +286,72 @@ class SubagentOrchestrator:
         logger.info(f"Spawning {len(subtasks)} subagents in parallel (max {max_concurrent})")
         
         semaphore = asyncio.Semaphore(max_concurrent)
+        results: list[SubagentResult | None] = [None] * len(subtasks)
         
-        async def limited_spawn(subtask: SubagentTask) -> SubagentResult:
+        async def limited_spawn(i: int, subtask: SubagentTask):
             async with semaphore:
-                return await self.spawn(subtask)
+                try:
+                    results[i] = await self.spawn(subtask)
+                except Exception as e:
+                    results[i] = SubagentResult(
+                        task_id=subtask.id,
+                        success=False,
+                        output="",
+                        error=str(e),
+                    )
         
-        tasks = [limited_spawn(subtask) for subtask in subtasks]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Handle any exceptions
-        final_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                final_results.append(SubagentResult(
-                    task_id=subtasks[i].id,
-                    success=False,
-                    output="",
-                    error=str(result),
-                ))
-            else:
-                final_results.append(result)
+        # Every failure is captured above, so gather only propagates
+        # cancellation, which it passes on to all the children
+        await asyncio.gather(*(limited_spawn(i, subtask) for i, subtask in enumerate(subtasks)))
+        
+        return results
+    
+    async def spawn_batch(
+        self,
+        subtasks: list[SubagentTask],
+        use_batch_api: bool = True,
+    ) -> list[SubagentResult]:
+        """Run subtasks as one Claude Message Batch, at half the usual price.
+        
+        Batches can take minutes and each request is a single turn without
+        tools, so this suits bulk, non-interactive work. With
+        ``use_batch_api=False`` this is spawn_parallel.
+        """
+        if not use_batch_api:
+            return await self.spawn_parallel(subtasks)
+        
+        from forge.agents.direct_llm_agent import execute_batch
+        
+        logger.info(f"Submitting {len(subtasks)} subagent tasks as a batch")
+        jobs = [
+            (
+                subtask.agent_definition,
+                Task(
+                    id=subtask.id,
+                    description=subtask.description,
+                    agent_name=subtask.agent_definition.name,
+                    context=subtask.context,
+                ),
+            )
+            for subtask in subtasks
+        ]
+        agent_results = await execute_batch(jobs, self.settings, self.working_dir)
         
-        return final_results
+        results = []
+        for subtask, result in zip(subtasks, agent_results):
+            subagent_result = SubagentResult(
+                task_id=subtask.id,
+                success=result.success,
+                output=result.output,
+                error=result.error,
+                cost_usd=result.cost_usd,
+                tokens_used=result.tokens_used,
+            )
+            self.results[subtask.id] = subagent_result
+            self.total_cost += subagent_result.cost_usd
+            self.total_tokens += subagent_result.tokens_used
+            results.append(subagent_result)
+        return results
     
     async def spawn_sequential(self, subtasks: list[SubagentTask], stop_on_failure: bool = True) -> list[SubagentResult]:
         """Spawn subagents sequentially, optionally stopping on failure."""
@@ -122,35 +368,73 @@ class SubagentOrchestrator:
         
         return results
     
-    async def spawn_with_dependencies(self, subtasks: list[SubagentTask], dependencies: dict[str, list[str]]) -> list[SubagentResult]:
-        """Spawn subagents respecting dependencies between them."""
+    async def spawn_with_dependencies(
+        self,
+        subtasks: list[SubagentTask],
+        dependencies: dict[str, list[str]],
+        max_concurrent: int = 5,
+    ) -> list[SubagentResult]:
+        """Spawn subagents respecting dependencies between them.
+        
+        Each subtask starts as soon as its own dependencies finish, not when
+        a whole wave does. Results are returned in completion order.
+        """
         logger.info(f"Spawning {len(subtasks)} subagents with dependencies")
         
-        # Build a map of task_id to subtask
+        # In-degree counts and reverse edges, built once, so each finished
+        # task only touches its own dependents. A dependency on an id that
+        # isn't among the subtasks is never met.
         task_map = {st.id: st for st in subtasks}
-        completed: set[str] = set()
+        indegree: dict[str, int] = {}
+        dependents: dict[str, list[str]] = defaultdict(list)
+        ready: deque[SubagentTask] = deque()
+        for subtask in subtasks:
+            deps = set(dependencies.get(subtask.id, ()))
+            indegree[subtask.id] = len(deps)
+            for dep in deps:
+                dependents[dep].append(subtask.id)
+            if not deps:
+                ready.append(subtask)
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def limited_spawn(subtask: SubagentTask) -> SubagentResult:
+            async with semaphore:
+                return await self.spawn(subtask)
+        
+        in_flight: dict[asyncio.Task, SubagentTask] = {}
         results: list[SubagentResult] = []
+        try:
+            while ready or in_flight:
+                while ready:
+                    subtask = ready.popleft()
+                    in_flight[asyncio.ensure_future(limited_spawn(subtask))] = subtask
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    subtask = in_flight.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        results.append(task.result())
+                    else:
+                        results.append(SubagentResult(
+                            task_id=subtask.id,
+                            success=False,
+                            output="",
+                            error=str(error),
+                        ))
+                    for dependent_id in dependents.get(subtask.id, ()):
+                        indegree[dependent_id] -= 1
+                        if indegree[dependent_id] == 0:
+                            ready.append(task_map[dependent_id])
+        finally:
+            # Only non-empty if we're unwinding from cancellation
+            for task in in_flight:
+                task.cancel()
         
-        while len(completed) < len(subtasks):
-            # Find tasks whose dependencies are all completed
-            ready = []
-            for subtask in subtasks:
-                if subtask.id in completed:
-                    continue
-                deps = dependencies.get(subtask.id, [])
-                if all(dep in completed for dep in deps):
-                    ready.append(subtask)
-            
-            if not ready:
-                # Deadlock or all done
-                break
-            
-            # Execute ready tasks in parallel
-            batch_results = await self.spawn_parallel(ready)
-            results.extend(batch_results)
-            
-            for result in batch_results:
-                completed.add(result.task_id)
+        if len(results) < len(subtasks):
+            # Cyclic or unknown dependencies
+            logger.warning(f"{len(subtasks) - len(results)} subtasks never became ready")
         
         return results
     
@@ -165,6 +449,20 @@ class SubagentOrchestrator:
         }
 
 
+# Subtask ids: a per-process prefix plus a counter, unique without
+# the urandom call uuid4 makes per id
+def _reset_ids():
+    """Start a new prefix and counter; forked children call this too."""
+    global _ID_PREFIX, _id_counter
+    _ID_PREFIX = f"{os.getpid():x}-{time.time_ns():x}-"
+    _id_counter = itertools.count()
+
+
+_reset_ids()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_ids)
+
+
 def create_subtask(
     description: str,
     agent_definition: AgentDefinition,
@@ -173,7 +471,7 @@ def create_subtask(
 ) -> SubagentTask:
     """Helper function to create a subtask."""
     return SubagentTask(
-        id=str(uuid.uuid4()),
+        id=f"{_ID_PREFIX}{next(_id_counter):x}",
         description=description,
         agent_definition=agent_definition,
         context=context or {},
@@ -5,11 +5,9 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from forge import Forge
-from forge.agents import ALL_AGENTS
+# Forge, the agent registries and the rest of rich are imported inside the
+# commands that use them, so `forge --help` stays fast
 
 app = typer.Typer(name="forge", help="Multi-agent AI engineering platform")
 console = Console()
@@ -18,6 +16,9 @@ console = Console()
 @app.command()
 def agents():
     """List all available agents."""
+    from rich.table import Table
+    from forge.agents import ALL_AGENTS
+    
     table = Table(title="Available Agents")
     table.add_column("Name", style="cyan")
     table.add_column("Description", style="white")
@@ -34,6 +35,9 @@ def analyze(
     path: Optional[str] = typer.Argument(None, help="Path to project to analyze"),
 ):
     """Analyze a project for issues."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from forge import Forge
+    
     target = Path(path) if path else Path.cwd()
     
     with Progress(
@@ -62,6 +66,9 @@ def fix(
     path: Optional[str] = typer.Option(None, "--path", "-p", help="Path to project"),
 ):
     """Fix a specific issue in the project."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from forge import Forge
+    
     target = Path(path) if path else Path.cwd()
     
     with Progress(
@@ -88,8 +95,12 @@ def fix(
 def run(
     goal: str = typer.Argument(..., help="High-level goal for the workflow"),
     path: Optional[str] = typer.Option(None, "--path", "-p", help="Path to project"),
+    batch: bool = typer.Option(False, "--batch", help="Submit all steps as one half-price Message Batch (slower, no tool use; analysis goals only)"),
 ):
     """Run a complete workflow based on a goal."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from forge import Forge
+    
     target = Path(path) if path else Path.cwd()
     
     with Progress(
@@ -99,17 +110,29 @@ def run(
     ) as progress:
         task = progress.add_task(f"Running workflow: {goal[:50]}...", total=None)
         
+        # Print each step's output as it arrives rather than holding it all
+        current_step = None
+        
+        def show_output(agent_name: str, text: str):
+            nonlocal current_step
+            if agent_name != current_step:
+                current_step = agent_name
+                progress.console.print(f"\n[cyan]{agent_name}:[/cyan]")
+            progress.console.print(text, markup=False, highlight=False)
+        
         forge = Forge(working_dir=target)
-        result = asyncio.run(forge.run(goal, target))
+        result = asyncio.run(forge.run(goal, target, batch=batch, on_output=show_output))
         
         progress.update(task, completed=True)
     
     if result.success:
         console.print(f"\n[green]Workflow complete![/green] ({result.steps_completed}/{result.total_steps} steps)\n")
-        for step_name, step_result in result.results.items():
-            console.print(f"[cyan]{step_name}:[/cyan]")
-            console.print(step_result.output[:500] + "..." if len(step_result.output) > 500 else step_result.output)
-            console.print()
+        if batch:
+            # Batched results arrive all at once, so nothing was streamed
+            for step_name, step_result in result.results.items():
+                console.print(f"[cyan]{step_name}:[/cyan]")
+                console.print(step_result.output[:500] + "..." if len(step_result.output) > 500 else step_result.output)
+                console.print()
         console.print(f"\n[dim]Total cost: ${result.total_cost_usd:.4f} | Tokens: {result.total_tokens}[/dim]")
     else:
         console.print(f"\n[red]Workflow failed at step {result.steps_completed}:[/red] {result.error}")
@@ -118,6 +141,9 @@ def run(
 @app.command()
 def cost():
     """Show cost summary."""
+    from rich.table import Table
+    from forge import Forge
+    
     forge = Forge()
     summary = forge.get_cost_summary()
     
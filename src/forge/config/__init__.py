@@ -1,3 +1,3 @@
 """Forge config module."""
-from forge.config.settings import ForgeSettings, AgentConfig, MemoryConfig, GitConfig, ModelConfig
-__all__ = ["ForgeSettings", "AgentConfig", "MemoryConfig", "GitConfig", "ModelConfig"]
+from forge.config.settings import ForgeSettings, get_settings, AgentConfig, MemoryConfig, GitConfig, ModelConfig
+__all__ = ["ForgeSettings", "get_settings", "AgentConfig", "MemoryConfig", "GitConfig", "ModelConfig"]
@@ -1,9 +1,11 @@
 """Forge Configuration Settings - SECURITY HARDENED"""
+import hashlib
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic_settings import BaseSettings
 
 
@@ -57,6 +59,18 @@ class ForgeSettings(BaseSettings):
     max_budget_usd: float = 10.0
     log_level: str = "INFO"
     log_file: Path | None = None
+    # Repeat executions of a goal are served from this cache; 0 disables it
+    execution_cache_ttl_seconds: float = 0.0
+    execution_cache_path: Path = Field(default_factory=lambda: Path.home() / ".forge" / "executions.db")
+    # Oldest agent messages are dropped once a queue holds this many
+    message_queue_max: int = 10_000
+    # Serve repeated or near-identical subagent tasks from the subagent caches
+    cache_enabled: bool = False
+    # Exact-match subagent cache entries are ignored after this long
+    subagent_cache_ttl_seconds: float = 86_400.0
+    semantic_cache_threshold: float = 0.92
+    # Most independent workflow steps Forge.run executes at once
+    max_parallel_agents: int = 4
     memory: MemoryConfig = Field(default_factory=MemoryConfig)
     git: GitConfig = Field(default_factory=GitConfig)
     models: dict[str, ModelConfig] = Field(default_factory=lambda: {
@@ -69,15 +83,30 @@ class ForgeSettings(BaseSettings):
         """Alias for max_budget_usd for compatibility."""
         return self.max_budget_usd
     
+    # field name -> (value, masked value), so repr/logging doesn't re-mask
+    _masked: dict[str, tuple[str, str]] = PrivateAttr(default_factory=dict)
+    
+    def _mask(self, name: str) -> str:
+        value = getattr(self, name)
+        cached = self._masked.get(name)
+        if cached is None or cached[0] is not value:
+            cached = self._masked[name] = (value, mask_secret(value))
+        return cached[1]
+    
     @property
     def anthropic_api_key_masked(self) -> str:
         """Get masked API key for safe logging."""
-        return mask_secret(self.anthropic_api_key)
+        return self._mask("anthropic_api_key")
     
     @property
     def openai_api_key_masked(self) -> str:
         """Get masked API key for safe logging."""
-        return mask_secret(self.openai_api_key)
+        return self._mask("openai_api_key")
+    
+    def fingerprint(self) -> str:
+        """Hash of the settings that shape results, excluding secrets."""
+        data = self.model_dump_json(exclude={"anthropic_api_key", "openai_api_key"})
+        return hashlib.sha256(data.encode()).hexdigest()
     
     def validate_api_keys(self) -> dict[str, bool]:
         """Validate that required API keys are set."""
@@ -106,3 +135,14 @@ class ForgeSettings(BaseSettings):
         super().__init__(**data)
         if self.config_dir is None:
             self.config_dir = self.project_dir / "config"
+        self._mask("anthropic_api_key")
+        self._mask("openai_api_key")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> ForgeSettings:
+    """Process-wide default settings, loaded from the environment once.
+    
+    Call ``get_settings.cache_clear()`` to pick up environment or .env changes.
+    """
+    return ForgeSettings()
@@ -1,41 +1,129 @@
 """Condenser for context window management"""
 import logging
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+
+@lru_cache(maxsize=1)
+def _load_encoding() -> Any:
+    """Load the tiktoken encoding on first use; None if it isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed, estimating tokens from length. Install with: pip install tiktoken")
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(texts: list[str]) -> list[int]:
+    """Token counts for several texts, encoded in one batch."""
+    enc = _load_encoding()
+    if enc is None:
+        return [len(text) // 4 for text in texts]  # Rough estimate
+    # Ordinary encoding treats special-token text as plain text instead of raising
+    return [len(tokens) for tokens in enc.encode_ordinary_batch(texts)]
+
+
+@dataclass(slots=True)
 class Message:
     role: str
     content: str
     metadata: dict[str, Any] = field(default_factory=dict)
+    token_count: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class CondenserState:
-    messages: list[Message] = field(default_factory=list)
+    messages: deque[Message] = field(default_factory=deque)
     total_tokens: int = 0
 
+Summarizer = Callable[[list[Message]], str]
+
+
+def claude_summarizer(api_key: str, model: str = "claude-3-5-haiku-20241022") -> Summarizer:
+    """Summarize messages with a small, fast Claude model."""
+    import anthropic
+    client = anthropic.Anthropic(api_key=api_key)
+    
+    def summarize(messages: list[Message]) -> str:
+        transcript = "\n\n".join(f"{m.role}: {m.content}" for m in messages)
+        response = client.messages.create(
+            model=model,
+            max_tokens=1024,
+            messages=[{
+                "role": "user",
+                "content": (
+                    "Summarize this conversation so it can replace the original. "
+                    "Keep every fact, decision, file path and open question.\n\n" + transcript
+                ),
+            }],
+        )
+        return response.content[0].text
+    
+    return summarize
+
+
 class Condenser:
-    """Manages context window by condensing old messages."""
+    """Manages context window by condensing old messages.
+    
+    With a summarizer, the oldest half of the history is replaced by a
+    summary; otherwise, or if summarizing fails, old messages are dropped.
+    """
     
-    def __init__(self, max_tokens: int = 100_000):
+    def __init__(self, max_tokens: int = 100_000, summarizer: Summarizer | None = None):
         self.max_tokens = max_tokens
+        self.summarizer = summarizer
         self._state = CondenserState()
     
     def add_message(self, role: str, content: str, metadata: dict | None = None):
-        msg = Message(role=role, content=content, metadata=metadata or {})
-        self._state.messages.append(msg)
-        self._state.total_tokens += len(content) // 4  # Rough estimate
+        self._append(role, content, metadata, count_tokens([content])[0])
         self._maybe_condense()
     
+    def add_messages(self, messages: list[dict[str, Any]]):
+        """Add many messages, counting their tokens in one batch."""
+        counts = count_tokens([m["content"] for m in messages])
+        for m, n in zip(messages, counts):
+            self._append(m["role"], m["content"], m.get("metadata"), n)
+        self._maybe_condense()
+    
+    def _append(self, role: str, content: str, metadata: dict | None, token_count: int):
+        msg = Message(role=role, content=content, metadata=metadata or {}, token_count=token_count)
+        self._state.messages.append(msg)
+        self._state.total_tokens += token_count
+    
     def _maybe_condense(self):
-        if self._state.total_tokens > self.max_tokens * 0.9:
-            # Keep last 50% of messages
-            keep = len(self._state.messages) // 2
-            self._state.messages = self._state.messages[-keep:]
-            self._state.total_tokens = sum(len(m.content) // 4 for m in self._state.messages)
-            logger.info(f"Condensed context to {len(self._state.messages)} messages")
+        state = self._state
+        threshold = self.max_tokens * 0.9
+        if state.total_tokens <= threshold:
+            return
+        if self.summarizer is not None and len(state.messages) > 2:
+            self._summarize_oldest()
+        # Drop the oldest messages until back under the threshold, always
+        # keeping the latest exchange and any summary in front
+        messages = state.messages
+        first = 1 if messages and messages[0].metadata.get("condensed") else 0
+        while state.total_tokens > threshold and len(messages) > first + 2:
+            state.total_tokens -= messages[first].token_count
+            del messages[first]
+        logger.info(f"Condensed context to {len(state.messages)} messages")
+    
+    def _summarize_oldest(self):
+        """Replace the oldest half of the messages with one summary message."""
+        state = self._state
+        old = [state.messages.popleft() for _ in range(len(state.messages) // 2)]
+        try:
+            summary = self.summarizer(old)
+        except Exception as e:
+            logger.warning(f"Summarization failed, dropping old messages instead: {e}")
+            state.messages.extendleft(reversed(old))
+            return
+        content = f"[Condensed earlier context]: {summary}"
+        msg = Message(role="system", content=content, metadata={"condensed": True}, token_count=count_tokens([content])[0])
+        state.messages.appendleft(msg)
+        state.total_tokens += msg.token_count - sum(m.token_count for m in old)
     
     def get_messages(self) -> list[dict[str, str]]:
         return [{"role": m.role, "content": m.content} for m in self._state.messages]
@@ -0,0 +1,78 @@
+"""Persistent cache of text embeddings"""
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    content_hash BLOB PRIMARY KEY,
+    vector BLOB NOT NULL
+)
+"""
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_MAX_PARAMS = 900
+
+
+def content_hash(text: str, model: str = "") -> bytes:
+    """Key an embedding on the text and the model that produced it."""
+    return hashlib.blake2b(f"{model}\x1f{text}".encode(), digest_size=16).digest()
+
+
+class EmbeddingCache:
+    """SQLite-backed store of float32 embedding vectors, keyed by content hash."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Batches may be written from asyncio.to_thread workers
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def get(self, key: bytes) -> np.ndarray | None:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Sequence[bytes]) -> dict[bytes, np.ndarray]:
+        """Look up several keys at once; missing keys are left out."""
+        found: dict[bytes, np.ndarray] = {}
+        try:
+            conn = self._connect()
+            for start in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[start:start + _MAX_PARAMS]
+                rows = conn.execute(
+                    f"SELECT content_hash, vector FROM embeddings WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Failed to read embedding cache: {e}")
+        return found
+
+    def put_many(self, pairs: Sequence[tuple[bytes, Any]]):
+        """Store (key, vector) pairs, replacing any earlier vectors for the keys."""
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    [(key, np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in pairs],
+                )
+        except Exception as e:
+            logger.warning(f"Failed to write embedding cache: {e}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
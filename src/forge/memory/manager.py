@@ -1,15 +1,61 @@
 """Memory Manager for long-term memory"""
-import json
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import threading
 import time
 import logging
+from collections import defaultdict
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Sequence
 from forge.config.settings import MemoryConfig
+from forge.utils import fastjson
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+_TOKEN = re.compile(r"\w+")
+
+# Entry ids: a per-process prefix plus a counter. Timestamps alone collide
+# when several entries are added within the clock's resolution.
+def _reset_ids():
+    """Start a new prefix and counter; forked children call this too."""
+    global _ID_PREFIX, _id_counter
+    _ID_PREFIX = f"mem_{os.getpid():x}-{time.time_ns():x}-"
+    _id_counter = itertools.count()
+
+
+_reset_ids()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_ids)
+
+# Longest substrings of tokens kept in the n-gram index used for matching
+# partial words
+_GRAM = 3
+
+# Most texts sent to the embedder in one request; providers cap the inputs
+# (and tokens) per call, so loading a large store is split up
+_EMBED_BATCH = 128
+
+# Embeds several texts in one call, returning one vector per text
+BatchEmbedder = Callable[[list[str]], Sequence[Sequence[float]]]
+
+
+def openai_embedder(api_key: str, model: str = "text-embedding-3-small") -> BatchEmbedder:
+    """Embed texts with an OpenAI embedding model (MemoryConfig.embedding_model)."""
+    import openai
+    client = openai.OpenAI(api_key=api_key)
+    
+    def embed(texts: list[str]) -> list[Sequence[float]]:
+        response = client.embeddings.create(model=model, input=texts)
+        return [d.embedding for d in response.data]
+    
+    return embed
+
+
+@dataclass(slots=True)
 class MemoryEntry:
     id: str
     content: str
@@ -19,40 +65,254 @@ class MemoryEntry:
     persist: bool = False
 
 class MemoryManager:
-    """Manages short-term and long-term memory."""
+    """Manages short-term and long-term memory.
+    
+    With an embedder, recall ranks entries by cosine similarity to the query
+    (weighted by importance); otherwise, or if embedding the query fails, it
+    falls back to a case-insensitive substring match. Vectors of long-term
+    entries are kept in an EmbeddingCache next to the store, and loaded
+    entries are only embedded (or read back) on the first vector recall.
+    """
     
-    def __init__(self, config: MemoryConfig):
+    def __init__(self, config: MemoryConfig, embed: BatchEmbedder | None = None):
         self.config = config
+        self.embed = embed
+        # Normalized float32 embeddings, row i for self._entries[i]; grown by
+        # doubling. numpy is only needed once an embedder is configured.
+        self._np: Any = None
+        self._embeddings: Any = None
+        self._vector_cache: Any = None
+        # Entries 0..n-1 (the loaded long-term store) that have no row yet
+        self._unembedded = 0
+        # Guards growing and writing the matrix, which add_async does from
+        # worker threads
+        self._embed_lock = threading.Lock()
+        # Serializes writes to the store, which add_async makes from worker threads
+        self._write_lock = threading.Lock()
         self.short_term: list[MemoryEntry] = []
         self.long_term: list[MemoryEntry] = []
+        # Every entry in insertion order, its lowercased content, an
+        # inverted index from lowercased word token to entry positions, and
+        # the tokens containing each substring of up to _GRAM characters
+        self._entries: list[MemoryEntry] = []
+        self._lowered: list[str] = []
+        self._index: defaultdict[str, set[int]] = defaultdict(set)
+        self._grams: defaultdict[str, set[str]] = defaultdict(set)
         self._load_persisted()
+        for entry in self.long_term:
+            self._index_entry(entry)
+        if embed is not None:
+            from forge.utils.optional import require_numpy
+            self._np = require_numpy()
+            from forge.memory.embedding_cache import EmbeddingCache
+            self._vector_cache = EmbeddingCache(config.persist_dir / "memory_vectors.db")
+            self._unembedded = len(self.long_term)
     
-    def _load_persisted(self):
-        persist_file = self.config.persist_dir / "memory.json"
-        if persist_file.exists():
+    def _embed_rows(self, start: int, texts: list[str], persist: bool = False):
+        """Embed texts into rows start..start+len(texts) of the matrix, _EMBED_BATCH at a time.
+        
+        Vectors already in the cache are reused; with persist, new ones are
+        added to it.
+        """
+        for offset in range(0, len(texts), _EMBED_BATCH):
+            self._embed_batch(start + offset, texts[offset:offset + _EMBED_BATCH], persist)
+    
+    def _embed_batch(self, start: int, texts: list[str], persist: bool):
+        from forge.memory.embedding_cache import content_hash
+        np = self._np
+        keys = [content_hash(text, self.config.embedding_model) for text in texts]
+        cached = self._vector_cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
             try:
-                data = json.loads(persist_file.read_text())
-                self.long_term = [MemoryEntry(**e) for e in data]
+                fresh = np.asarray(self.embed([texts[i] for i in missing]), dtype=np.float32)
             except Exception as e:
-                logger.warning(f"Failed to load memory: {e}")
+                # The rows stay zero, so these entries score 0 in vector recall
+                logger.warning(f"Failed to embed memory: {e}")
+                return
+            fresh = fresh / np.maximum(np.linalg.norm(fresh, axis=1, keepdims=True), 1e-12)
+            if persist:
+                self._vector_cache.put_many([(keys[i], vec) for i, vec in zip(missing, fresh)])
+            cached.update((keys[i], vec) for i, vec in zip(missing, fresh))
+        vectors = np.stack([cached[key] for key in keys])
+        needed = start + len(texts)
+        with self._embed_lock:
+            if self._embeddings is None:
+                self._embeddings = np.zeros((max(8, needed), vectors.shape[1]), dtype=np.float32)
+            elif needed > len(self._embeddings):
+                grown = np.zeros((max(needed, 2 * len(self._embeddings)), self._embeddings.shape[1]), dtype=np.float32)
+                grown[:len(self._embeddings)] = self._embeddings
+                self._embeddings = grown
+            self._embeddings[start:needed] = vectors
+    
+    def _index_entry(self, entry: MemoryEntry):
+        pos = len(self._entries)
+        lowered = entry.content.lower()
+        self._entries.append(entry)
+        self._lowered.append(lowered)
+        for token in set(_TOKEN.findall(lowered)):
+            if token not in self._index:
+                self._index_grams(token)
+            self._index[token].add(pos)
+    
+    def _index_grams(self, token: str):
+        for n in range(1, _GRAM + 1):
+            for i in range(len(token) - n + 1):
+                self._grams[token[i:i + n]].add(token)
     
-    def _save_persisted(self):
-        self.config.persist_dir.mkdir(parents=True, exist_ok=True)
-        persist_file = self.config.persist_dir / "memory.json"
-        data = [{"id": e.id, "content": e.content, "importance": e.importance, "timestamp": e.timestamp, "metadata": e.metadata, "persist": e.persist} for e in self.long_term]
-        persist_file.write_text(json.dumps(data, indent=2))
+    def _tokens_containing(self, word: str) -> set[str] | list[str]:
+        """Indexed tokens that contain word, found through its n-grams."""
+        if len(word) <= _GRAM:
+            return self._grams.get(word, set())
+        grams = sorted(
+            (self._grams.get(word[i:i + _GRAM], set()) for i in range(len(word) - _GRAM + 1)),
+            key=len,
+        )
+        return [token for token in grams[0].intersection(*grams[1:]) if word in token]
+    
+    def _postings(self, query: str) -> list[set[int]]:
+        """Positions that can contain each word of the query.
+        
+        A word with non-word characters on both sides must be a whole token
+        of the content; one at either end of the query may be part of a
+        longer token, so it matches the tokens containing it, which are
+        looked up in the n-gram index rather than by scanning every token.
+        """
+        postings = []
+        index = self._index
+        for match in _TOKEN.finditer(query):
+            word = match.group()
+            if match.start() > 0 and match.end() < len(query):
+                postings.append(index.get(word, set()))
+            else:
+                postings.append(set().union(*(index[token] for token in self._tokens_containing(word))))
+        return postings
+    
+    @property
+    def _persist_file(self) -> Path:
+        return self.config.persist_dir / "memory.jsonl"
+    
+    def _load_persisted(self):
+        persist_file = self._persist_file
+        if not persist_file.exists():
+            self._load_legacy()
+            return
+        try:
+            with persist_file.open("rb") as f:
+                for line in f:
+                    if line.strip():
+                        self.long_term.append(MemoryEntry(**fastjson.loads(line)))
+        except Exception as e:
+            logger.warning(f"Failed to load memory: {e}")
+    
+    def _load_legacy(self):
+        """Migrate a memory.json written by earlier versions to JSONL."""
+        legacy_file = self.config.persist_dir / "memory.json"
+        if not legacy_file.exists():
+            return
+        try:
+            self.long_term = [MemoryEntry(**e) for e in fastjson.loads(legacy_file.read_bytes())]
+        except Exception as e:
+            logger.warning(f"Failed to load memory: {e}")
+            return
+        self.compact()
+    
+    def _append_persisted(self, entry: MemoryEntry):
+        """Write one entry as a line; earlier entries are never rewritten."""
+        line = fastjson.dumps(asdict(entry), newline=True)
+        with self._write_lock:
+            self.config.persist_dir.mkdir(parents=True, exist_ok=True)
+            with self._persist_file.open("ab") as f:
+                f.write(line)
+    
+    def compact(self):
+        """Rewrite the long-term store from memory, atomically."""
+        data = b"".join(fastjson.dumps(asdict(e), newline=True) for e in self.long_term)
+        with self._write_lock:
+            self.config.persist_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._persist_file.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(self._persist_file)
     
     def add(self, content: str, importance: float = 0.5, persist: bool = False, metadata: dict | None = None) -> MemoryEntry:
-        entry = MemoryEntry(id=f"mem_{time.time()}", content=content, importance=importance, persist=persist, metadata=metadata or {})
+        entry = self._store(content, importance, persist, metadata)
+        if self.embed is not None:
+            self._embed_rows(len(self._entries) - 1, [content], persist)
+        if persist:
+            self._append_persisted(entry)
+        return entry
+    
+    async def add_async(self, content: str, importance: float = 0.5, persist: bool = False, metadata: dict | None = None) -> MemoryEntry:
+        """Like add(), but embeds and writes to disk in a worker thread so the event loop isn't blocked."""
+        entry = self._store(content, importance, persist, metadata)
+        if self.embed is not None:
+            await asyncio.to_thread(self._embed_rows, len(self._entries) - 1, [content], persist)
+        if persist:
+            await asyncio.to_thread(self._append_persisted, entry)
+        return entry
+    
+    def _store(self, content: str, importance: float, persist: bool, metadata: dict | None) -> MemoryEntry:
+        """Create an entry and make it keyword-recallable."""
+        entry = MemoryEntry(id=f"{_ID_PREFIX}{next(_id_counter):x}", content=content, importance=importance, persist=persist, metadata=metadata or {})
         if persist:
             self.long_term.append(entry)
-            self._save_persisted()
         else:
             self.short_term.append(entry)
+        self._index_entry(entry)
         return entry
     
     def recall(self, query: str, limit: int = 10) -> list[MemoryEntry]:
-        all_entries = self.short_term + self.long_term
-        # Simple keyword matching for now
-        matches = [e for e in all_entries if query.lower() in e.content.lower()]
-        return sorted(matches, key=lambda x: x.importance, reverse=True)[:limit]
+        """The entries most relevant to the query.
+        
+        Ranked by importance × cosine similarity when an embedder is set,
+        else entries containing the query (case-insensitive), most important first.
+        """
+        if self.embed is not None and limit > 0:
+            self._embed_loaded()
+            if self._embeddings is not None:
+                best = self._vector_recall(query, limit)
+                if best is not None:
+                    return best
+        query = query.lower()
+        postings = self._postings(query)
+        if postings:
+            # Intersect smallest-first; the substring check below confirms
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            candidates = range(len(self._entries))
+        matches = [pos for pos in candidates if query in self._lowered[pos]]
+        
+        # Ties keep short-term before long-term, then insertion order
+        entries = self._entries
+        best = heapq.nlargest(
+            limit, matches, key=lambda pos: (entries[pos].importance, not entries[pos].persist, -pos),
+        )
+        return [entries[pos] for pos in best]
+    
+    def _embed_loaded(self):
+        """Give the loaded long-term entries their rows, once."""
+        count, self._unembedded = self._unembedded, 0
+        if count:
+            self._embed_rows(0, [e.content for e in self._entries[:count]], persist=True)
+    
+    def _vector_recall(self, query: str, limit: int) -> list[MemoryEntry] | None:
+        """Top entries by importance × similarity; None if the query can't be embedded."""
+        np = self._np
+        try:
+            qvec = np.asarray(self.embed([query])[0], dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Failed to embed query, falling back to keyword recall: {e}")
+            return None
+        qvec /= max(float(np.linalg.norm(qvec)), 1e-12)
+        
+        # Entries still being embedded by add_async may not have a row yet
+        matrix = self._embeddings
+        n = min(len(self._entries), len(matrix))
+        scores = matrix[:n] @ qvec
+        # Shortlist by similarity alone, then re-rank by importance
+        k = min(n, limit)
+        top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        entries = self._entries
+        ranked = sorted(top.tolist(), key=lambda pos: entries[pos].importance * float(scores[pos]), reverse=True)
+        return [entries[pos] for pos in ranked]
@@ -1,11 +1,28 @@
 """Vector Store for semantic memory using ChromaDB"""
+import asyncio
+import hashlib
+import json
 import logging
+import mmap
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import cached_property, partial
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Iterator
 
 logger = logging.getLogger(__name__)
 
+# Below this many files, starting worker processes costs more than it saves
+_PARALLEL_MIN_FILES = 64
+
+# A NUL byte in this many leading bytes marks a file as binary
+_BINARY_PROBE_BYTES = 4096
+
 @dataclass
 class VectorSearchResult:
     id: str
@@ -13,72 +30,214 @@ class VectorSearchResult:
     score: float
     metadata: dict[str, Any]
 
+class _QueryCache:
+    """Recent search results, served again for queries close in meaning.
+    
+    A cached result only answers searches with the same limit and filter.
+    Entries expire after ttl seconds and the least recently used is evicted
+    beyond maxsize.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float, threshold: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        # (params, query) -> (normalized vector, results, created)
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, list[VectorSearchResult], float]] = OrderedDict()
+        # Stacked vectors of the entries, rebuilt after the entries change
+        self._stacked: tuple[list[tuple[str, str]], Any] | None = None
+    
+    def lookup(self, np: Any, vec: Any, params: str) -> list[VectorSearchResult] | None:
+        if not self._entries:
+            return None
+        if self._stacked is None:
+            keys = list(self._entries)
+            self._stacked = (keys, np.stack([self._entries[k][0] for k in keys]))
+        keys, matrix = self._stacked
+        scores = matrix @ vec
+        now = time.monotonic()
+        for pos in np.argsort(-scores):
+            if scores[pos] < self.threshold:
+                break
+            key = keys[pos]
+            entry = self._entries.get(key)
+            if entry is None or key[0] != params or now - entry[2] > self.ttl:
+                continue
+            self._entries.move_to_end(key)
+            return list(entry[1])
+        return None
+    
+    def add(self, vec: Any, params: str, query: str, results: list[VectorSearchResult]):
+        now = time.monotonic()
+        self._entries[(params, query)] = (vec, list(results), now)
+        self._entries.move_to_end((params, query))
+        for key in [k for k, e in self._entries.items() if now - e[2] > self.ttl]:
+            del self._entries[key]
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        self._stacked = None
+    
+    def clear(self):
+        self._entries.clear()
+        self._stacked = None
+
+
 class VectorStore:
-    """Vector store for semantic search using ChromaDB."""
+    """Vector store for semantic search using ChromaDB.
     
-    def __init__(self, persist_dir: Path, collection_name: str = "forge_memory"):
+    Searches whose query embedding has cosine similarity of at least
+    query_cache_threshold to a recent one reuse its results; any write
+    clears that cache. A query_cache_size of 0 disables it.
+    
+    The HNSW parameters only take effect when the collection is created.
+    Chroma's defaults (M=16, construction_ef=100, search_ef=10) lose recall
+    past ~100k vectors; M=24 with construction_ef=128 and search_ef=100 keeps
+    recall around 0.99 at a modest cost in build time and index size.
+    """
+    
+    def __init__(
+        self,
+        persist_dir: Path,
+        collection_name: str = "forge_memory",
+        query_cache_size: int = 512,
+        query_cache_ttl: float = 300.0,
+        query_cache_threshold: float = 0.95,
+        hnsw_m: int = 24,
+        hnsw_ef_construction: int = 128,
+        hnsw_ef_search: int = 100,
+    ):
         self.persist_dir = persist_dir
         self.collection_name = collection_name
-        self._client = None
-        self._collection = None
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        # _client and _collection are cached properties, created on first use
         self._embedding_fn = None
+        self._embedding_cache = None
+        self._embedding_model = ""
+        self._np: Any = None
+        self._query_cache = _QueryCache(query_cache_size, query_cache_ttl, query_cache_threshold) if query_cache_size > 0 else None
     
-    def _init_client(self):
-        if self._client is not None:
-            return
-        
+    @cached_property
+    def _client(self) -> Any:
+        """The Chroma client and the embedding setup, created on first use."""
         try:
             import chromadb
+            import numpy as np
             from chromadb.config import Settings
-            
-            self.persist_dir.mkdir(parents=True, exist_ok=True)
-            self._client = chromadb.PersistentClient(
-                path=str(self.persist_dir),
-                settings=Settings(anonymized_telemetry=False)
-            )
-            self._collection = self._client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={"hnsw:space": "cosine"}
-            )
-            logger.info(f"Initialized ChromaDB at {self.persist_dir}")
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+            from forge.memory.embedding_cache import EmbeddingCache
         except ImportError:
             logger.warning("ChromaDB not installed. Install with: pip install chromadb")
             raise
+        
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        client = chromadb.PersistentClient(
+            path=str(self.persist_dir),
+            settings=Settings(anonymized_telemetry=False)
+        )
+        # Embeddings are computed here, through the cache, and handed to
+        # Chroma precomputed; the collection's function must match
+        self._np = np
+        self._embedding_fn = DefaultEmbeddingFunction()
+        # Cached vectors are unit length; the suffix keeps them apart from
+        # raw vectors cached by earlier versions
+        self._embedding_model = f"{type(self._embedding_fn).__name__}:unit"
+        self._embedding_cache = EmbeddingCache(self.persist_dir / "emb_cache.sqlite")
+        return client
+    
+    @cached_property
+    def _collection(self) -> Any:
+        """The collection, created on first use; later accesses are a plain attribute hit."""
+        collection = self._client.get_or_create_collection(
+            name=self.collection_name,
+            embedding_function=self._embedding_fn,
+            metadata={
+                "hnsw:space": "cosine",
+                "hnsw:M": self.hnsw_m,
+                "hnsw:construction_ef": self.hnsw_ef_construction,
+                "hnsw:search_ef": self.hnsw_ef_search,
+                "hnsw:batch_size": 100,
+                "hnsw:sync_threshold": 1000,
+            }
+        )
+        logger.info(f"Initialized ChromaDB at {self.persist_dir}")
+        return collection
+    
+    def _embed(self, texts: list[str]) -> list[Any]:
+        """Embed texts, reusing cached vectors and embedding only the rest.
+        
+        Vectors are L2-normalized once, before caching, so cosine similarity
+        against them is a plain dot product. The collection uses cosine
+        space, so Chroma's distances are unchanged.
+        """
+        from forge.memory.embedding_cache import content_hash
+        keys = [content_hash(text, self._embedding_model) for text in texts]
+        found = self._embedding_cache.get_many(keys)
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            np = self._np
+            vectors = np.asarray(self._embedding_fn(list(missing.values())), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            fresh = list(zip(missing, vectors))
+            self._embedding_cache.put_many(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
     
     def add(self, id: str, content: str, metadata: dict[str, Any] | None = None) -> bool:
         """Add a document to the vector store."""
         try:
-            self._init_client()
-            self._collection.add(
+            collection = self._collection
+            collection.add(
                 ids=[id],
                 documents=[content],
+                embeddings=self._embed([content]),
                 metadatas=[metadata or {}]
             )
+            self._invalidate_queries()
             return True
         except Exception as e:
             logger.error(f"Failed to add document: {e}")
             return False
     
-    def add_batch(self, ids: list[str], contents: list[str], metadatas: list[dict] | None = None) -> bool:
-        """Add multiple documents to the vector store."""
+    def add_batch(self, ids: list[str], contents: list[str], metadatas: list[dict] | None = None, upsert: bool = False) -> bool:
+        """Add multiple documents to the vector store.
+        
+        With upsert, documents whose ids already exist are overwritten
+        instead of skipped.
+        """
         try:
-            self._init_client()
-            self._collection.add(
+            collection = self._collection
+            write = collection.upsert if upsert else collection.add
+            write(
                 ids=ids,
                 documents=contents,
+                embeddings=self._embed(contents),
                 metadatas=metadatas or [{} for _ in ids]
             )
+            self._invalidate_queries()
             return True
         except Exception as e:
             logger.error(f"Failed to add batch: {e}")
             return False
     
+    async def add_batch_async(self, ids: list[str], contents: list[str], metadatas: list[dict] | None = None, upsert: bool = False) -> bool:
+        """Like add_batch(), but runs in a worker thread so the event loop isn't blocked."""
+        return await asyncio.to_thread(self.add_batch, ids, contents, metadatas, upsert)
+    
     def search(self, query: str, limit: int = 10, filter: dict | None = None) -> list[VectorSearchResult]:
         """Search for similar documents."""
         try:
-            self._init_client()
-            results = self._collection.query(
-                query_texts=[query],
+            collection = self._collection
+            query_vec = self._embed([query])[0]
+            if self._query_cache is not None:
+                params = json.dumps([limit, filter], sort_keys=True, default=str)
+                cached = self._query_cache.lookup(self._np, query_vec, params)
+                if cached is not None:
+                    return cached
+            
+            results = collection.query(
+                query_embeddings=[query_vec],
                 n_results=limit,
                 where=filter
             )
@@ -92,6 +251,8 @@ class VectorStore:
                         score=1 - results['distances'][0][i] if results['distances'] else 0.0,
                         metadata=results['metadatas'][0][i] if results['metadatas'] else {}
                     ))
+            if self._query_cache is not None:
+                self._query_cache.add(query_vec, params, query, search_results)
             return search_results
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -100,22 +261,268 @@ class VectorStore:
     def delete(self, ids: list[str]) -> bool:
         """Delete documents by ID."""
         try:
-            self._init_client()
             self._collection.delete(ids=ids)
+            self._invalidate_queries()
             return True
         except Exception as e:
             logger.error(f"Delete failed: {e}")
             return False
     
+    def update_metadatas(self, ids: list[str], metadatas: list[dict]) -> bool:
+        """Replace the metadata of existing documents."""
+        try:
+            self._collection.update(ids=ids, metadatas=metadatas)
+            self._invalidate_queries()
+            return True
+        except Exception as e:
+            logger.error(f"Metadata update failed: {e}")
+            return False
+    
+    def get_metadatas(self, ids: list[str] | None = None, where: dict | None = None) -> dict[str, dict]:
+        """Metadata of the documents with the given ids or matching a Chroma where filter."""
+        try:
+            found = self._collection.get(ids=ids, where=where, include=["metadatas"])
+            return dict(zip(found["ids"], found["metadatas"] or []))
+        except Exception as e:
+            logger.error(f"Metadata lookup failed: {e}")
+            return {}
+    
+    def _invalidate_queries(self):
+        """Drop cached search results after the collection changes."""
+        if self._query_cache is not None:
+            self._query_cache.clear()
+    
     def count(self) -> int:
         """Get the number of documents in the store."""
         try:
-            self._init_client()
             return self._collection.count()
         except Exception:
             return 0
 
 
+def _chunk_text(content: str, chunk_size: int, overlap: int) -> list[str]:
+    """Split content into overlapping chunks.
+    
+    Chunks end just after a line break when one falls far enough into the
+    chunk to keep moving forward, so lines aren't cut in half.
+    """
+    if len(content) <= chunk_size:
+        return [content] if content and not content.isspace() else []
+    
+    chunks = []
+    start = 0
+    n = len(content)
+    while True:
+        end = min(start + chunk_size, n)
+        if end < n:
+            newline = content.rfind("\n", start + overlap + 1, end)
+            if newline != -1:
+                end = newline + 1
+        # isspace() scans in place, where strip() would copy the chunk
+        chunk = content[start:end]
+        if not chunk.isspace():
+            chunks.append(chunk)
+        if end == n:
+            break
+        start = end - overlap
+    
+    return chunks
+
+
+def _is_continuation(byte: int) -> bool:
+    """Whether a byte is inside a UTF-8 multi-byte character (10xxxxxx)."""
+    return byte & 0xC0 == 0x80
+
+
+def _decode_chunk(data: bytes) -> str:
+    """Decode a chunk of a source file; bad bytes become U+FFFD instead of
+    dropping the file, and newlines are normalized as read_text() would."""
+    text = data.decode("utf-8", "replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _chunk_buffer(buf: Any, chunk_size: int, overlap: int) -> list[str]:
+    """Like _chunk_text, but over UTF-8 bytes (e.g. an mmap), sizes in bytes.
+    
+    Each chunk is sliced and decoded on its own. Hard cuts are moved back
+    to a character boundary, so no character is split between chunks.
+    """
+    chunks = []
+    start = 0
+    n = len(buf)
+    while True:
+        end = min(start + chunk_size, n)
+        if end < n:
+            newline = buf.rfind(b"\n", start + overlap + 1, end)
+            if newline != -1:
+                end = newline + 1
+            else:
+                while end > start + overlap + 1 and _is_continuation(buf[end]):
+                    end -= 1
+        chunk = _decode_chunk(buf[start:end])
+        if chunk and not chunk.isspace():
+            chunks.append(chunk)
+        if end == n:
+            break
+        start = end - overlap
+        while _is_continuation(buf[start]):
+            start += 1
+    
+    return chunks
+
+
+def chunk_id(chunk: str) -> str:
+    """Id of a code chunk: a hash of its content, so it survives renames and
+    identical chunks in different files are stored once."""
+    return hashlib.blake2b(chunk.encode(), digest_size=16).hexdigest()
+
+
+# Occurrences kept in a chunk's metadata; repeats past this are only counted
+_MAX_OCCURRENCES = 32
+
+
+def _occurrence_file(occurrence: str) -> str:
+    """The file part of a "file:chunk_index" occurrence."""
+    return occurrence.rpartition(":")[0]
+
+
+@dataclass
+class _IndexRun:
+    """Bookkeeping for one run of indexing a file or directory.
+    
+    Every chunk written is stamped with this run's id and an "occurrences"
+    string listing up to _MAX_OCCURRENCES file:chunk_index places it was
+    found at, one per line, with the full number in "occurrence_count".
+    Content-hash ids don't get overwritten when a file's content changes,
+    so when the run ends, chunks from earlier runs are dropped from the
+    files this run re-read, and deleted once no other file has them.
+    """
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Files read in this run, and every occurrence of each chunk in them
+    files: set[str] = field(default_factory=set)
+    occurrences: dict[str, list[str]] = field(default_factory=dict)
+    # Stored metadata by chunk id, occurrences in files outside this run
+    # that chunks already had, and whether any write failed
+    metadatas: dict[str, dict] = field(default_factory=dict)
+    carried: dict[str, list[str]] = field(default_factory=dict)
+    failed: bool = False
+    
+    def dedupe(
+        self,
+        file_path: Path,
+        ids: list[str],
+        chunks: list[str],
+        metadatas: list[dict],
+    ) -> tuple[list[str], list[str], list[dict]]:
+        """Stamp a file's new chunks and drop ones already seen, recording where they recur."""
+        self.files.add(str(file_path))
+        keep = []
+        for i, (cid, meta) in enumerate(zip(ids, metadatas)):
+            where = f"{meta['file']}:{meta['chunk_index']}"
+            seen = self.occurrences.get(cid)
+            if seen is not None:
+                seen.append(where)
+                continue
+            self.occurrences[cid] = [where]
+            meta.update(index_run=self.run_id, occurrences=where, occurrence_count=1)
+            # A copy, since the written dict may still be in use by a writer thread
+            self.metadatas[cid] = dict(meta)
+            keep.append(i)
+        if len(keep) == len(ids):
+            return ids, chunks, metadatas
+        return [ids[i] for i in keep], [chunks[i] for i in keep], [metadatas[i] for i in keep]
+    
+    def write(self, vector_store: "VectorStore", ids: list[str], chunks: list[str], metadatas: list[dict]) -> bool:
+        """Upsert a batch, keeping note of where its chunks were found before."""
+        for cid, old in vector_store.get_metadatas(ids).items():
+            if old.get("index_run") != self.run_id:
+                self.carried[cid] = str(old.get("occurrences", "")).splitlines()
+        ok = vector_store.add_batch(ids, chunks, metadatas, upsert=True)
+        if not ok:
+            self.failed = True
+        return ok
+    
+    def _stamp(self, meta: dict, occurrences: list[str]) -> dict:
+        """Point meta at its first occurrence and record the (bounded) rest."""
+        file, _, index = occurrences[0].rpartition(":")
+        return {
+            **meta,
+            "file": file,
+            "chunk_index": int(index),
+            "occurrences": "\n".join(occurrences[:_MAX_OCCURRENCES]),
+            "occurrence_count": len(occurrences),
+        }
+    
+    def _outside(self, occurrences: list[str]) -> list[str]:
+        """The occurrences in files this run didn't read."""
+        return [o for o in occurrences if _occurrence_file(o) not in self.files]
+    
+    def finish(self, vector_store: "VectorStore", batch_size: int = 128) -> bool:
+        """Record every occurrence of this run's chunks, then drop stale chunks.
+        
+        If any write failed, nothing is swept, since the chunks that would
+        replace the old ones may not be there; returns False then.
+        """
+        if self.failed:
+            logger.error("Some chunks failed to store; kept chunks from earlier runs")
+            return False
+        
+        updates = {}
+        for cid, seen in self.occurrences.items():
+            carried = self._outside(self.carried.get(cid, []))
+            if len(seen) > 1 or carried:
+                updates[cid] = self._stamp(self.metadatas[cid], seen + carried)
+        
+        # Chunks from earlier runs attributed to a re-read file
+        stale = []
+        files = list(self.files)
+        for start in range(0, len(files), batch_size):
+            where = {"$and": [{"file": {"$in": files[start:start + batch_size]}}, {"index_run": {"$ne": self.run_id}}]}
+            for cid, meta in vector_store.get_metadatas(where=where).items():
+                listed = str(meta.get("occurrences", "")).splitlines()
+                rest = self._outside(listed)
+                if rest:
+                    updates[cid] = self._stamp(meta, rest)
+                elif meta.get("occurrence_count", 0) <= len(listed):
+                    stale.append(cid)
+                # Otherwise it may still be in a file past the listed ones
+        
+        update_ids = list(updates)
+        for start in range(0, len(update_ids), batch_size):
+            ids = update_ids[start:start + batch_size]
+            vector_store.update_metadatas(ids, [updates[cid] for cid in ids])
+        for start in range(0, len(stale), batch_size):
+            vector_store.delete(stale[start:start + batch_size])
+        return True
+
+
+def _chunk_file(file_path: Path, chunk_size: int, overlap: int) -> tuple[list[str], list[str], list[dict]]:
+    """Read and chunk a file into (ids, chunks, metadatas), without storing anything.
+    
+    Module-level so it can run in worker processes. The file is mapped rather
+    than read and chunked by byte offsets, so only one chunk at a time is
+    ever copied and decoded, and binary files are skipped before any
+    decoding.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return [], [], []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\x00", 0, _BINARY_PROBE_BYTES) != -1:
+                    return [], [], []
+                chunks = _chunk_buffer(mm, chunk_size, overlap)
+    except Exception as e:
+        logger.warning(f"Could not read {file_path}: {e}")
+        return [], [], []
+    
+    ids = [chunk_id(chunk) for chunk in chunks]
+    metadatas = [{"file": str(file_path), "chunk_index": i, "language": file_path.suffix} for i in range(len(chunks))]
+    return ids, chunks, metadatas
+
+
 class CodebaseIndex:
     """Index a codebase for semantic search."""
     
@@ -123,57 +530,150 @@ class CodebaseIndex:
         self.vector_store = vector_store
     
     def index_file(self, file_path: Path, chunk_size: int = 1000, overlap: int = 200) -> int:
-        """Index a single file, returning the number of chunks created."""
-        try:
-            content = file_path.read_text()
-        except Exception as e:
-            logger.warning(f"Could not read {file_path}: {e}")
+        """Index a single file, returning the number of chunks created (0 if storing them failed)."""
+        run = _IndexRun()
+        ids, chunks, metadatas = run.dedupe(file_path, *self._file_chunks(file_path, chunk_size, overlap))
+        if chunks:
+            run.write(self.vector_store, ids, chunks, metadatas)
+        if not run.finish(self.vector_store):
             return 0
+        return len(chunks)
+    
+    @classmethod
+    def _file_chunks(cls, file_path: Path, chunk_size: int, overlap: int) -> tuple[list[str], list[str], list[dict]]:
+        """Read and chunk a file into (ids, chunks, metadatas), without storing anything.
         
-        chunks = self._chunk_content(content, chunk_size, overlap)
-        if not chunks:
-            return 0
+        This is the one chunking hook for every indexing path. It is a
+        classmethod so directory indexing can run it in worker processes;
+        an override there must be defined on a module-level class.
+        """
+        return _chunk_file(file_path, chunk_size, overlap)
+    
+    def index_directory(
+        self,
+        directory: Path,
+        extensions: list[str] | None = None,
+        batch_size: int = 128,
+        workers: int | None = None,
+    ) -> dict[str, int]:
+        """Index all files in a directory.
         
-        ids = [f"{file_path}:{i}" for i in range(len(chunks))]
-        metadatas = [{"file": str(file_path), "chunk_index": i, "language": file_path.suffix} for i in range(len(chunks))]
+        Chunks from many files are sent to the store together, batch_size at a
+        time, so the per-call overhead of the store is paid once per batch.
+        Large directories are read and chunked in up to workers processes
+        (default: one per CPU); writes to the store stay on this thread.
         
-        self.vector_store.add_batch(ids, chunks, metadatas)
-        return len(chunks)
+        stats["failed_batches"] counts batches the store rejected; if there
+        are any, chunks from earlier runs are left in place.
+        """
+        stats = {"files": 0, "chunks": 0, "failed_batches": 0}
+        run = _IndexRun()
+        for batch in self._iter_batches(directory, extensions, batch_size, stats, run, workers):
+            if not run.write(self.vector_store, *batch):
+                stats["failed_batches"] += 1
+        run.finish(self.vector_store, batch_size)
+        
+        logger.info(f"Indexed {stats['files']} files with {stats['chunks']} chunks")
+        return stats
+    
+    async def index_directory_async(
+        self,
+        directory: Path,
+        extensions: list[str] | None = None,
+        batch_size: int = 128,
+        max_concurrent: int = 8,
+        workers: int | None = None,
+    ) -> dict[str, int]:
+        """Index all files in a directory, writing up to max_concurrent batches at once.
+        
+        Files are read and chunked in a worker thread while earlier batches are
+        being written, so disk reads overlap with store writes. Stats are as
+        for index_directory().
+        """
+        stats = {"files": 0, "chunks": 0, "failed_batches": 0}
+        run = _IndexRun()
+        batches = self._iter_batches(directory, extensions, batch_size, stats, run, workers)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent)
+        
+        async def write():
+            while (batch := await queue.get()) is not None:
+                if not await asyncio.to_thread(run.write, self.vector_store, *batch):
+                    stats["failed_batches"] += 1
+        
+        writers = [asyncio.create_task(write()) for _ in range(max_concurrent)]
+        try:
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                await queue.put(batch)
+            for _ in writers:
+                await queue.put(None)
+            await asyncio.gather(*writers)
+        finally:
+            for w in writers:
+                w.cancel()
+        await asyncio.to_thread(run.finish, self.vector_store, batch_size)
+        
+        logger.info(f"Indexed {stats['files']} files with {stats['chunks']} chunks")
+        return stats
     
-    def index_directory(self, directory: Path, extensions: list[str] | None = None) -> dict[str, int]:
-        """Index all files in a directory."""
+    def _iter_batches(
+        self,
+        directory: Path,
+        extensions: list[str] | None,
+        batch_size: int,
+        stats: dict[str, int],
+        run: _IndexRun,
+        workers: int | None = None,
+    ) -> Iterator[tuple[list[str], list[str], list[dict]]]:
+        """Walk the directory and yield (ids, chunks, metadatas) of up to batch_size chunks.
+        
+        Files and chunks are counted into stats as they are read. A chunk
+        identical to one already seen in this run is stored only once; run
+        records its other occurrences.
+        """
         extensions = extensions or [".py", ".js", ".ts", ".tsx", ".jsx", ".go", ".rs", ".java", ".md"]
         ignore_dirs = {".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build"}
         
-        stats = {"files": 0, "chunks": 0}
+        # One walk for all extensions; ignored directories are pruned before
+        # being descended into
+        suffixes = tuple(extensions)
+        files = []
+        for root, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if d not in ignore_dirs]
+            files.extend(Path(root, name) for name in filenames if name.endswith(suffixes))
+        
+        ids: list[str] = []
+        chunks: list[str] = []
+        metadatas: list[dict] = []
         
-        for ext in extensions:
-            for file_path in directory.rglob(f"*{ext}"):
-                if any(ignored in file_path.parts for ignored in ignore_dirs):
-                    continue
-                chunks = self.index_file(file_path)
-                if chunks > 0:
+        # The same hook whether or not the pool is used
+        chunk_one = partial(type(self)._file_chunks, chunk_size=1000, overlap=200)
+        workers = workers or os.cpu_count() or 1
+        with ExitStack() as stack:
+            if workers > 1 and len(files) >= _PARALLEL_MIN_FILES:
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                results = pool.map(chunk_one, files, chunksize=16)
+            else:
+                results = map(chunk_one, files)
+            
+            for file_path, file_result in zip(files, results):
+                if file_result[1]:
                     stats["files"] += 1
-                    stats["chunks"] += chunks
+                file_ids, file_chunks, file_metadatas = run.dedupe(file_path, *file_result)
+                if file_chunks:
+                    stats["chunks"] += len(file_chunks)
+                    ids += file_ids
+                    chunks += file_chunks
+                    metadatas += file_metadatas
+                while len(ids) >= batch_size:
+                    yield ids[:batch_size], chunks[:batch_size], metadatas[:batch_size]
+                    del ids[:batch_size], chunks[:batch_size], metadatas[:batch_size]
         
-        logger.info(f"Indexed {stats['files']} files with {stats['chunks']} chunks")
-        return stats
+        if ids:
+            yield ids, chunks, metadatas
     
     def _chunk_content(self, content: str, chunk_size: int, overlap: int) -> list[str]:
         """Split content into overlapping chunks."""
-        if len(content) <= chunk_size:
-            return [content] if content.strip() else []
-        
-        chunks = []
-        start = 0
-        while start < len(content):
-            end = start + chunk_size
-            chunk = content[start:end]
-            if chunk.strip():
-                chunks.append(chunk)
-            start = end - overlap
-        
-        return chunks
+        return _chunk_text(content, chunk_size, overlap)
     
     def search_code(self, query: str, limit: int = 10, file_filter: str | None = None) -> list[VectorSearchResult]:
         """Search the indexed codebase."""
@@ -1,15 +1,18 @@
 """Forge Orchestrator - Central brain for multi-agent coordination - BUG FIXED"""
 import asyncio
 import logging
+import re
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from functools import partial
+from typing import Any, Callable
 
 from forge.agents.base import AgentDefinition, AgentResult, Task
-from forge.agents.claude_agent import ClaudeAgent
-from forge.agents import ALL_AGENTS
-from forge.config.settings import ForgeSettings
+from forge.agents.claude_agent import ClaudeAgent, shared_agent
+from forge.agents import get_agent as get_agent_definition, list_all_agents
+from forge.config.settings import ForgeSettings, get_settings
+from forge.memory.condenser import count_tokens
 from forge.utils.cost_tracker import CostTracker
 
 logger = logging.getLogger(__name__)
@@ -18,14 +21,51 @@ logger = logging.getLogger(__name__)
 def estimate_tokens(text: str) -> int:
     """
     Estimate token count from text.
-    Uses a more accurate approximation: ~4 characters per token for English text.
-    This is still an approximation - for exact counts, use tiktoken or the API.
+    Counts cl100k_base tokens with tiktoken when it is installed, otherwise
+    assumes ~4 characters per token.
     """
     if not text:
         return 0
-    # More accurate: ~4 chars per token for English, ~2-3 for code
-    # We use 3.5 as a middle ground
-    return max(1, int(len(text) / 3.5))
+    return max(1, count_tokens([text])[0])
+
+
+# Goal keywords by category. The lookahead makes each match zero-width, so
+# keywords that overlap (e.g. "document" and "test" in "documentest") are
+# all found in one pass, like separate substring checks would.
+_GOAL_KEYWORDS = re.compile(
+    r"(?=(?P<analyze>analyze|review|check|audit)"
+    r"|(?P<security>security|vulnerab|safe)"
+    r"|(?P<fix>fix|debug|repair)"
+    r"|(?P<improve>improve|refactor|optimize)"
+    r"|(?P<test>test|verify)"
+    r"|(?P<document>document|readme|comment))",
+    re.IGNORECASE,
+)
+
+# (category, agent, task prefix) in the order steps run
+_GOAL_STEPS = (
+    ("analyze", "backend_analyzer", "Analyze the codebase"),
+    ("security", "security_analyzer", "Check for security issues"),
+    ("fix", "debugger", "Fix issues"),
+    ("improve", "improver", "Improve code"),
+    ("test", "tester", "Create and run tests"),
+    ("document", "documenter", "Update documentation"),
+)
+
+# Read-only agents; adjacent steps run by these can execute concurrently.
+# Steps that edit files run one at a time, after the analysis before them.
+_CONCURRENT_AGENTS = frozenset({"backend_analyzer", "security_analyzer"})
+
+
+def _waves(steps: list[tuple[str, str]]) -> list[list[tuple[str, str]]]:
+    """Group steps into waves: runs of adjacent read-only steps, else single steps."""
+    waves: list[list[tuple[str, str]]] = []
+    for step in steps:
+        if waves and step[0] in _CONCURRENT_AGENTS and waves[-1][-1][0] in _CONCURRENT_AGENTS:
+            waves[-1].append(step)
+        else:
+            waves.append([step])
+    return waves
 
 
 @dataclass
@@ -47,7 +87,7 @@ class Forge:
         settings: ForgeSettings | None = None,
         working_dir: Path | None = None,
     ):
-        self.settings = settings or ForgeSettings()
+        self.settings = settings or get_settings()
         self.working_dir = working_dir or self.settings.project_dir
         self.cost_tracker = CostTracker(budget_usd=self.settings.budget_usd)
         self.logger = logging.getLogger("forge.orchestrator")
@@ -55,21 +95,16 @@ class Forge:
     
     def list_agents(self) -> list[str]:
         """List all available agent names."""
-        return list(ALL_AGENTS.keys())
+        return list_all_agents()
     
     def get_agent(self, name: str) -> ClaudeAgent | None:
         """Get or create an agent by name."""
-        if name not in ALL_AGENTS:
-            self.logger.warning(f"Agent not found: {name}")
-            return None
-        
         if name not in self._agents:
-            definition = ALL_AGENTS[name]
-            self._agents[name] = ClaudeAgent(
-                definition=definition,
-                settings=self.settings,
-                working_dir=self.working_dir,
-            )
+            definition = get_agent_definition(name)
+            if definition is None:
+                self.logger.warning(f"Agent not found: {name}")
+                return None
+            self._agents[name] = shared_agent(definition, self.settings, self.working_dir)
         
         return self._agents[name]
     
@@ -93,10 +128,11 @@ class Forge:
             # Estimate tokens if not provided by SDK
             result.tokens_used = estimate_tokens(result.output)
         
+        input_tokens, output_tokens = result.token_split()
         self.cost_tracker.record(
             model=agent.definition.model,
-            input_tokens=result.tokens_used // 2,  # Rough split
-            output_tokens=result.tokens_used // 2,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
         )
         
         return result
@@ -119,16 +155,37 @@ class Forge:
         if result.tokens_used == 0 and result.output:
             result.tokens_used = estimate_tokens(result.output)
         
+        input_tokens, output_tokens = result.token_split()
         self.cost_tracker.record(
             model=agent.definition.model,
-            input_tokens=result.tokens_used // 2,
-            output_tokens=result.tokens_used // 2,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
         )
         
         return result
     
-    async def run(self, goal: str, target: Path) -> WorkflowResult:
-        """Run a complete workflow based on a high-level goal."""
+    async def run(
+        self,
+        goal: str,
+        target: Path,
+        batch: bool = False,
+        on_output: Callable[[str, str], None] | None = None,
+    ) -> WorkflowResult:
+        """Run a complete workflow based on a high-level goal.
+        
+        With ``batch``, all steps go out together as one Claude Message Batch:
+        half price, but each step is a single turn without tools and the
+        batch can take minutes to finish. Goals that need an agent which
+        writes files fail without submitting anything.
+        
+        ``on_output(agent_name, text)`` receives each step's output as it
+        streams in; step results then keep only the tail of their output. It
+        is not called for batched runs.
+        
+        Adjacent read-only steps (analysis and security review) run
+        concurrently, up to ``settings.max_parallel_agents`` at a time; their
+        output may then interleave in ``on_output``.
+        """
         self.logger.info(f"Starting workflow: {goal}")
         
         # Decompose goal into steps
@@ -139,79 +196,142 @@ class Forge:
             total_steps=len(steps),
         )
         
-        for i, (agent_name, task_description) in enumerate(steps):
-            self.logger.info(f"Step {i+1}/{len(steps)}: {agent_name}")
-            
-            agent = self.get_agent(agent_name)
-            if not agent:
-                workflow_result.success = False
-                workflow_result.error = f"Agent not found: {agent_name}"
-                break
-            
-            task = Task(
-                id=str(uuid.uuid4()),
-                description=task_description,
-                agent_name=agent_name,
-                context={"target": str(target), "goal": goal},
-            )
-            
-            result = await agent.execute(task)
-            
-            if result.tokens_used == 0 and result.output:
-                result.tokens_used = estimate_tokens(result.output)
-            
-            workflow_result.results[agent_name] = result
-            workflow_result.steps_completed += 1
-            workflow_result.total_cost_usd += result.cost_usd
-            workflow_result.total_tokens += result.tokens_used
+        if batch:
+            await self._run_batch(goal, target, steps, workflow_result)
+            return workflow_result
+        
+        semaphore = asyncio.Semaphore(self.settings.max_parallel_agents)
+        
+        async def execute(agent: ClaudeAgent, task: Task) -> AgentResult:
+            async with semaphore:
+                return await agent.execute(task)
+        
+        step_number = 0
+        for wave in _waves(steps):
+            missing = None
+            runs = []
+            for agent_name, task_description in wave:
+                step_number += 1
+                self.logger.info(f"Step {step_number}/{len(steps)}: {agent_name}")
+                
+                agent = self.get_agent(agent_name)
+                if not agent:
+                    # Steps after a missing agent never run
+                    missing = agent_name
+                    break
+                
+                if on_output is not None:
+                    # Streaming agents hold a per-call sink, so they aren't shared
+                    agent = ClaudeAgent(
+                        agent.definition, self.settings, self.working_dir,
+                        on_delta=partial(on_output, agent_name),
+                    )
+                
+                runs.append((agent_name, agent, self._step_task(goal, target, agent_name, task_description)))
             
-            self.cost_tracker.record(
-                model=agent.definition.model,
-                input_tokens=result.tokens_used // 2,
-                output_tokens=result.tokens_used // 2,
-            )
+            results = await asyncio.gather(*(execute(agent, task) for _, agent, task in runs))
             
-            if not result.success:
-                workflow_result.success = False
-                workflow_result.error = result.error
+            # Record every step that ran, so its cost is tracked, then stop
+            # if any of them failed or the budget ran out
+            carry_on = [
+                self._record_step(workflow_result, agent_name, agent.definition, result)
+                for (agent_name, agent, _), result in zip(runs, results)
+            ]
+            if not all(carry_on):
                 break
-            
-            # Check budget
-            if self.cost_tracker.is_over_budget():
+            if missing is not None:
                 workflow_result.success = False
-                workflow_result.error = "Budget exceeded"
+                workflow_result.error = f"Agent not found: {missing}"
                 break
         
         return workflow_result
     
-    def _decompose_goal(self, goal: str) -> list[tuple[str, str]]:
-        """Decompose a high-level goal into agent tasks."""
-        goal_lower = goal.lower()
+    async def _run_batch(
+        self,
+        goal: str,
+        target: Path,
+        steps: list[tuple[str, str]],
+        workflow_result: WorkflowResult,
+    ):
+        """Run workflow steps as one Message Batch, then record them in order."""
+        from forge.agents.direct_llm_agent import execute_batch
         
-        steps = []
+        # A tool-less batch turn can't make the edits these agents exist for
+        editing = [name for name, _ in steps if (d := get_agent_definition(name)) is not None and d.edits_files]
+        if editing:
+            workflow_result.success = False
+            workflow_result.error = f"Batch runs have no tools, so {', '.join(editing)} can't edit files; run without --batch"
+            return
         
-        # Analysis phase
-        if any(word in goal_lower for word in ["analyze", "review", "check", "audit"]):
-            steps.append(("backend_analyzer", f"Analyze the codebase: {goal}"))
+        jobs = []
+        missing = None
+        for agent_name, task_description in steps:
+            definition = get_agent_definition(agent_name)
+            if definition is None:
+                # Steps after a missing agent would never have run
+                missing = agent_name
+                break
+            jobs.append((definition, self._step_task(goal, target, agent_name, task_description)))
+        
+        results = await execute_batch(jobs, self.settings, self.working_dir)
+        
+        for (definition, task), result in zip(jobs, results):
+            if not self._record_step(workflow_result, task.agent_name, definition, result):
+                return
+        
+        if missing is not None:
+            workflow_result.success = False
+            workflow_result.error = f"Agent not found: {missing}"
+    
+    def _step_task(self, goal: str, target: Path, agent_name: str, task_description: str) -> Task:
+        return Task(
+            id=str(uuid.uuid4()),
+            description=task_description,
+            agent_name=agent_name,
+            context={"target": str(target), "goal": goal},
+        )
+    
+    def _record_step(
+        self,
+        workflow_result: WorkflowResult,
+        agent_name: str,
+        definition: AgentDefinition,
+        result: AgentResult,
+    ) -> bool:
+        """Add a step result to the workflow; return whether to carry on."""
+        if result.tokens_used == 0 and result.output:
+            result.tokens_used = estimate_tokens(result.output)
         
-        # Security check
-        if any(word in goal_lower for word in ["security", "vulnerab", "safe"]):
-            steps.append(("security_analyzer", f"Check for security issues: {goal}"))
+        workflow_result.results[agent_name] = result
+        workflow_result.steps_completed += 1
+        workflow_result.total_cost_usd += result.cost_usd
+        workflow_result.total_tokens += result.tokens_used
         
-        # Fix/improve phase
-        if any(word in goal_lower for word in ["fix", "debug", "repair"]):
-            steps.append(("debugger", f"Fix issues: {goal}"))
+        input_tokens, output_tokens = result.token_split()
+        self.cost_tracker.record(
+            model=definition.model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
         
-        if any(word in goal_lower for word in ["improve", "refactor", "optimize"]):
-            steps.append(("improver", f"Improve code: {goal}"))
+        if not result.success:
+            workflow_result.success = False
+            workflow_result.error = result.error
+            return False
         
-        # Testing phase
-        if any(word in goal_lower for word in ["test", "verify"]):
-            steps.append(("tester", f"Create and run tests: {goal}"))
+        # Check budget
+        if self.cost_tracker.is_over_budget():
+            workflow_result.success = False
+            workflow_result.error = "Budget exceeded"
+            return False
         
-        # Documentation phase
-        if any(word in goal_lower for word in ["document", "readme", "comment"]):
-            steps.append(("documenter", f"Update documentation: {goal}"))
+        return True
+    
+    def _decompose_goal(self, goal: str) -> list[tuple[str, str]]:
+        """Decompose a high-level goal into agent tasks."""
+        # One scan finds every category mentioned; steps keep the order below
+        found = {m.lastgroup for m in _GOAL_KEYWORDS.finditer(goal)}
+        steps = [(agent, f"{prefix}: {goal}") for category, agent, prefix in _GOAL_STEPS if category in found]
         
         # Default: analyze then improve
         if not steps:
@@ -40,6 +40,8 @@ from enum import Enum
 from typing import Optional
 import uuid
 
+from forge.utils import fastjson
+
 
 class ChangeType(Enum):
     """Types of changes that can be made to files."""
@@ -61,7 +63,7 @@ class ChangeStatus(Enum):
     ROLLED_BACK = "rolled_back"  # Changes were reverted
 
 
-@dataclass
+@dataclass(slots=True)
 class Change:
     """
     A single file change within a ChangePlan.
@@ -123,7 +125,7 @@ class Change:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangePlan:
     """
     A coordinated set of changes to be applied to the codebase.
@@ -180,14 +182,31 @@ class ChangePlan:
     execution_log: list[str] = field(default_factory=list)
     error_message: Optional[str] = None
     
+    # file_count is cached; the key is bumped by add_change and checked
+    # against the list's length, so appends that bypass add_change are
+    # noticed too. Call invalidate() after editing or replacing changes.
+    _changes_version: int = field(default=0, init=False, repr=False, compare=False)
+    _file_count_key: Optional[tuple[int, int]] = field(default=None, init=False, repr=False, compare=False)
+    _file_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def invalidate(self) -> None:
+        """Drop the cached file count."""
+        self._changes_version += 1
+    
     @property
     def file_count(self) -> int:
         """Number of files affected."""
-        return len(set(c.file for c in self.changes))
+        key = (self._changes_version, len(self.changes))
+        if self._file_count_key != key:
+            self._file_count = len({c.file for c in self.changes})
+            self._file_count_key = key
+        return self._file_count
     
     @property
     def is_safe_to_apply(self) -> bool:
         """Check if plan can be safely applied."""
+        # Never cached: this guards a destructive action, and changes can be
+        # edited in place without the plan knowing
         return (
             self.status == ChangeStatus.APPROVED and
             len(self.changes) > 0 and
@@ -197,6 +216,7 @@ class ChangePlan:
     def add_change(self, change: Change) -> None:
         """Add a change to the plan."""
         self.changes.append(change)
+        self._changes_version += 1
     
     def to_dict(self) -> dict:
         return {
@@ -252,5 +272,13 @@ class ChangePlan:
         )
         return plan
     
+    def to_json(self) -> bytes:
+        """Serialize to compact UTF-8 JSON (orjson when installed)."""
+        return fastjson.dumps(self.to_dict())
+    
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "ChangePlan":
+        return cls.from_dict(fastjson.loads(data))
+    
     def __str__(self) -> str:
         return f"[{self.status.value.upper()}] {self.id}: {self.title} ({self.file_count} files)"
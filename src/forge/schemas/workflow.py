@@ -45,7 +45,9 @@ Usage:
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Any
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Optional, Any
 import uuid
 
 
@@ -136,6 +138,29 @@ class WorkflowStep:
     error_message: Optional[str] = None
     retry_attempts: int = 0
     
+    # Input resolvers, compiled from `inputs` on first use
+    # (copy of the inputs they were built from, resolvers)
+    _compiled_inputs: Optional[tuple[dict[str, Any], dict[str, Callable[["WorkflowDefinition"], Any]]]] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    
+    def resolve_inputs(self, workflow: "WorkflowDefinition") -> dict[str, Any]:
+        """Resolve every input of this step against a workflow.
+        
+        Resolvers are rebuilt whenever inputs has changed since they were
+        compiled.
+        """
+        if self._compiled_inputs is None or self._compiled_inputs[0] != self.inputs:
+            self._compiled_inputs = (
+                dict(self.inputs),
+                {key: compile_input(value) for key, value in self.inputs.items()},
+            )
+        return {key: resolve(workflow) for key, resolve in self._compiled_inputs[1].items()}
+    
+    def __getstate__(self) -> dict:
+        # Resolvers are closures; they're rebuilt after unpickling
+        return {**self.__dict__, "_compiled_inputs": None}
+    
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -271,22 +296,16 @@ class WorkflowDefinition:
     
     def get_ready_steps(self) -> list[WorkflowStep]:
         """Get steps that are ready to execute (dependencies met)."""
-        ready = []
-        for step in self.steps:
-            if step.status != StepStatus.PENDING:
-                continue
-            
-            # Check if all dependencies are completed
-            deps_met = all(
-                self.get_step(dep_id).status == StepStatus.COMPLETED
-                for dep_id in step.depends_on
-                if self.get_step(dep_id) is not None
-            )
-            
-            if deps_met:
-                ready.append(step)
-        
-        return ready
+        # One pass for every step's status instead of a get_step() scan per dependency
+        # (reversed so the first step with a duplicated id wins, as in get_step)
+        statuses = {step.id: step.status for step in reversed(self.steps)}
+        return [
+            step for step in self.steps
+            if step.status == StepStatus.PENDING
+            # Unknown dependency ids are ignored
+            and all(statuses.get(dep_id, StepStatus.COMPLETED) == StepStatus.COMPLETED
+                    for dep_id in step.depends_on)
+        ]
     
     def resolve_input(self, value: Any) -> Any:
         """
@@ -298,33 +317,7 @@ class WorkflowDefinition:
         - $step_id.change_plan - Reference step change plan
         - $step_id.result - Reference step result
         """
-        if not isinstance(value, str) or not value.startswith("$"):
-            return value
-        
-        parts = value[1:].split(".")
-        if len(parts) < 2:
-            return value
-        
-        source = parts[0]
-        key = parts[1]
-        
-        if source == "workflow":
-            return self.inputs.get(key)
-        
-        step = self.get_step(source)
-        if step is None:
-            return value
-        
-        if key == "findings":
-            return step.findings
-        elif key == "change_plan":
-            return step.change_plan
-        elif key == "eval_result":
-            return step.eval_result
-        elif key == "result":
-            return step.result
-        else:
-            return step.outputs.get(key)
+        return compile_input(value)(self)
     
     def to_dict(self) -> dict:
         return {
@@ -381,3 +374,37 @@ class WorkflowDefinition:
     
     def __str__(self) -> str:
         return f"[{self.status.value.upper()}] {self.id}: {self.name} ({self.progress_percent:.0f}% complete)"
+
+
+# Step attributes a reference can name directly; anything else is an output key
+_STEP_ATTRS = ("findings", "change_plan", "eval_result", "result")
+
+
+def compile_input(value: Any) -> Callable[[WorkflowDefinition], Any]:
+    """Turn a step input into a resolver, parsing any reference only once."""
+    if not isinstance(value, str) or not value.startswith("$"):
+        return lambda workflow: value
+    return _compile_ref(value)
+
+
+@lru_cache(maxsize=256)
+def _compile_ref(value: str) -> Callable[[WorkflowDefinition], Any]:
+    parts = value[1:].split(".")
+    if len(parts) < 2:
+        return lambda workflow: value
+    
+    source, key = parts[0], parts[1]
+    
+    if source == "workflow":
+        return lambda workflow: workflow.inputs.get(key)
+    
+    if key in _STEP_ATTRS:
+        read = attrgetter(key)
+    else:
+        read = lambda step: step.outputs.get(key)
+    
+    def resolve(workflow: WorkflowDefinition) -> Any:
+        step = workflow.get_step(source)
+        return value if step is None else read(step)
+    
+    return resolve
@@ -27,7 +27,7 @@ class CodeTool:
         ignore_dirs = {".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build"}
         
         for path in self.project_dir.rglob("*"):
-            if any(ignored in path.parts for ignored in ignore_dirs):
+            if not ignore_dirs.isdisjoint(path.parts):
                 continue
             if path.is_file():
                 structure.files.append(path)
@@ -95,7 +95,7 @@ async def analyze_project(args: dict[str, Any]) -> dict:
         for item in path.rglob("*"):
             if file_count >= max_files:
                 break
-            if any(ignored in item.parts for ignored in ignore_dirs):
+            if not ignore_dirs.isdisjoint(item.parts):
                 continue
             try:
                 rel_path = str(item.relative_to(path))
@@ -142,7 +142,7 @@ async def search_code(args: dict[str, Any]) -> dict:
         for file_path in path.rglob(f"*{ext}"):
             if len(results) >= max_results:
                 break
-            if any(ignored in file_path.parts for ignored in ignore_dirs):
+            if not ignore_dirs.isdisjoint(file_path.parts):
                 continue
             try:
                 if file_path.stat().st_size > max_file_size:
@@ -1,4 +1,5 @@
 """Git Integration Tool - BUG FIXED"""
+import hashlib
 import logging
 import subprocess
 from pathlib import Path
@@ -79,6 +80,16 @@ class GitTool:
         except GitError:
             return False
     
+    def state_fingerprint(self) -> str | None:
+        """Hash HEAD plus any uncommitted changes; None outside a repository."""
+        try:
+            head = self._run_git("rev-parse", "HEAD").stdout
+            status = self._run_git("status", "--porcelain", "--untracked-files=all").stdout
+            diff = self._run_git("diff", "HEAD", "--no-ext-diff", "--binary").stdout
+        except GitError:
+            return None
+        return hashlib.sha256("\x1f".join((head, status, diff)).encode()).hexdigest()
+    
     def create_branch(self, name: str) -> bool:
         """Create a new branch with the forge prefix."""
         branch_name = f"{self.branch_prefix}{name}"
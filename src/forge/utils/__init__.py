@@ -1,4 +1,5 @@
 """Forge utils module."""
 from forge.utils.logging import setup_logging
 from forge.utils.cost_tracker import CostTracker, CostEntry, estimate_cost
-__all__ = ["setup_logging", "CostTracker", "CostEntry", "estimate_cost"]
+from forge.utils.execution_cache import ExecutionCache
+__all__ = ["setup_logging", "CostTracker", "CostEntry", "estimate_cost", "ExecutionCache"]
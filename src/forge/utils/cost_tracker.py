@@ -4,7 +4,7 @@ import logging
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -93,7 +93,7 @@ class CostTracker:
         output_cost = (output_tokens / 1000) * pricing["output"]
         return input_cost + output_cost
     
-    def record(
+    def _make_entry(
         self,
         model: str,
         input_tokens: int,
@@ -103,10 +103,9 @@ class CostTracker:
         agent_name: str | None = None,
         metadata: dict[str, Any] | None = None,
     ) -> CostEntry:
-        """Record a cost entry."""
+        """Price and build a cost entry without recording it."""
         cost = self.calculate_cost(model, input_tokens, output_tokens)
-        
-        entry = CostEntry(
+        return CostEntry(
             timestamp=time.time(),
             model=model,
             provider=provider,
@@ -117,14 +116,46 @@ class CostTracker:
             agent_name=agent_name,
             metadata=metadata or {},
         )
-        
+    
+    def record(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        provider: str = "anthropic",
+        task_id: str | None = None,
+        agent_name: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> CostEntry:
+        """Record a cost entry."""
+        entry = self._make_entry(
+            model, input_tokens, output_tokens, provider, task_id, agent_name, metadata
+        )
         self.entries.append(entry)
         self._check_budget_alerts()
         self._save()
         
-        logger.info(f"Recorded cost: ${cost:.4f} ({model}, {input_tokens}+{output_tokens} tokens)")
+        self._log_entry(entry)
         return entry
     
+    def record_batch(self, records: Iterable[dict[str, Any]]) -> list[CostEntry]:
+        """Record several entries (as ``record()`` kwargs) with one save."""
+        entries = [self._make_entry(**r) for r in records]
+        if entries:
+            self.entries.extend(entries)
+            self._check_budget_alerts()
+            self._save()
+        
+        for entry in entries:
+            self._log_entry(entry)
+        return entries
+    
+    def _log_entry(self, entry: CostEntry):
+        logger.info(
+            f"Recorded cost: ${entry.cost_usd:.4f} "
+            f"({entry.model}, {entry.input_tokens}+{entry.output_tokens} tokens)"
+        )
+    
     def _check_budget_alerts(self):
         """Check if any budget thresholds have been crossed."""
         total = self.get_total_cost()
@@ -145,6 +176,14 @@ class CostTracker:
         """Get total cost across all entries."""
         return sum(e.cost_usd for e in self.entries)
     
+    @property
+    def total_cost_usd(self) -> float:
+        return self.get_total_cost()
+    
+    @property
+    def total_tokens(self) -> int:
+        return sum(e.input_tokens + e.output_tokens for e in self.entries)
+    
     def get_remaining_budget(self) -> float:
         """Get remaining budget."""
         return max(0, self.budget_usd - self.get_total_cost())
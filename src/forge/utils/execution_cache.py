@@ -0,0 +1,85 @@
+"""Persistent cache of workflow execution results"""
+import hashlib
+import json
+import logging
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    goal_fingerprint BLOB PRIMARY KEY,
+    result_blob BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    tokens_saved INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def execution_key(
+    goal: str,
+    context: dict | None,
+    working_dir: Path,
+    settings_fingerprint: str,
+    repo_state: str,
+) -> bytes:
+    """Fingerprint everything that decides what a goal execution produces."""
+    parts = (
+        goal,
+        json.dumps(context or {}, sort_keys=True, default=str),
+        str(working_dir),
+        settings_fingerprint,
+        repo_state,
+    )
+    return hashlib.sha256("\x1f".join(parts).encode()).digest()
+
+
+class ExecutionCache:
+    """SQLite-backed store of pickled results, keyed on an execution fingerprint."""
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(_SCHEMA)
+        return self._conn
+
+    def get(self, key: bytes) -> Any | None:
+        """Return the cached result for a key, or None if missing or expired."""
+        try:
+            row = self._connect().execute(
+                "SELECT result_blob, created_at FROM executions WHERE goal_fingerprint = ?",
+                (key,),
+            ).fetchone()
+            if row is None or time.time() - row[1] > self.ttl_seconds:
+                return None
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Failed to read execution cache: {e}")
+            return None
+
+    def put(self, key: bytes, result: Any, tokens_saved: int = 0):
+        """Store a result, replacing any earlier entry for the key."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?)",
+                    (key, pickle.dumps(result), time.time(), tokens_saved),
+                )
+        except Exception as e:
+            logger.warning(f"Failed to write execution cache: {e}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
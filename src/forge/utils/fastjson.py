@@ -0,0 +1,25 @@
+"""Compact JSON encoding, using orjson when it is installed"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any, newline: bool = False) -> bytes:
+    """Encode compactly to UTF-8 bytes, optionally with a trailing newline."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+    text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return (text + "\n" if newline else text).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,14 @@
+"""Imports of optional dependencies"""
+from typing import Any
+
+
+def require_numpy() -> Any:
+    """Import numpy, raising an ImportError that says how to install it."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "numpy is required for embedding-based caching and recall. "
+            "Install with: pip install 'forge[cache]'"
+        ) from e
+    return numpy